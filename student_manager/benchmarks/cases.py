@@ -0,0 +1,197 @@
+from itertools import product
+from database.query_builder import STUDENT_SORT_KEYS
+from database.pagination import StudentPager
+
+FILTER_FIELDS = ("college", "year_level", "gender", "enrollment_year")
+SEARCH_FIELDS = ("search_id", "search_first_name", "search_last_name")
+SEARCH_MODES = ("prefix", "exact", "contains", "fuzzy")
+SORT_ORDERS = ("Ascending", "Descending")
+
+
+def _search_text(value, mode):
+    if mode == "prefix":
+        return value[:2]
+    if mode == "contains":
+        return value[1:4] if len(value) > 3 else value
+    if mode == "fuzzy" and len(value) > 2:
+        # One adjacent swap away from the real value
+        return value[0] + value[2] + value[1] + value[3:]
+    return value
+
+
+def filter_cases(sample):
+    """Yield (name, filters) for every filter, search and sort shape the main window can produce.
+
+    sample is a student row; its values are used so every filter matches something.
+    """
+    values = {
+        'college': sample['college_code'],
+        'year_level': sample['year_level'],
+        'gender': sample['gender'],
+        'enrollment_year': int(sample['student_id'][:4]),
+        'search_id': sample['student_id'],
+        'search_first_name': sample['first_name'],
+        'search_last_name': sample['last_name']
+    }
+    searches = [None] + list(product(SEARCH_FIELDS, SEARCH_MODES))
+    sorts = [None] + list(product(STUDENT_SORT_KEYS, SORT_ORDERS))
+
+    for enabled in product((False, True), repeat=len(FILTER_FIELDS)):
+        for search in searches:
+            for sort in sorts:
+                filters = {field: values[field] for field, on in zip(FILTER_FIELDS, enabled) if on}
+                parts = ["+".join(filters) or "all"]
+                if search:
+                    field, mode = search
+                    filters[field] = _search_text(values[field], mode)
+                    filters['search_mode'] = mode
+                    parts.append(f"{field}:{mode}")
+                if sort:
+                    filters['sort_by'], filters['sort_order'] = sort
+                    parts.append(f"sort={sort[0]}:{'desc' if sort[1] == 'Descending' else 'asc'}")
+                yield "|".join(parts), filters
+
+
+def read_methods(db, page_size=20, full_scan=False):
+    """(name, fn(filters), uses_sort) run against every filter case.
+
+    Methods that ignore the sort order are only timed on the unsorted cases.
+    """
+    def last_page(filters):
+        pager = StudentPager(db, page_size)
+        total = db.count_students(filters)
+        return pager.fetch(filters, max(1, -(-total // page_size)))[0]
+
+    methods = [
+        ("count_students", db.count_students, False),
+        ("get_students_page:first", lambda filters: db.get_students_page(filters, 1, page_size), True),
+        ("get_students_keyset:first", lambda filters: db.get_students_keyset(filters, limit=page_size), True),
+        ("pager:last", last_page, True),
+    ]
+    if full_scan:
+        methods.append(("get_students", db.get_students, True))
+    return methods
+
+
+def reference_cases(db, sample):
+    """(method, case, setup, fn, teardown) for the college/course lookups"""
+    return [
+        ("get_colleges", "all", None, db.get_colleges, None),
+        ("get_courses_by_college", sample['college_code'], None,
+         lambda: db.get_courses_by_college(sample['college_code']), None),
+        ("get_all_courses", "all", None, db.get_all_courses, None),
+        ("get_enrollment_years", "all", None, db.get_enrollment_years, None),
+    ]
+
+
+def _bench_id(year, n):
+    """YYYY-NNNN ID for the n-th benchmark student of the series starting at year.
+
+    Past 9999 the year steps back by three, so the 2099, 2098 and 2097 series never meet.
+    """
+    return f"{year - 3 * (n // 10000)}-{n % 10000:04d}"
+
+
+def write_cases(db, sample, batch_size=1000):
+    """(method, case, setup, fn, teardown) for the mutators.
+
+    setup() runs untimed before each repetition and returns the arguments
+    for fn, so every timed call starts from the same state; teardown (if
+    any) runs once afterwards to leave the sample college and course as
+    they were.
+    """
+    college = sample['college_code']
+    course = sample['course_code']
+    renamed_college = college[:9] + "X"
+    renamed_course = course[:19] + "X"
+    counter = iter(range(10 ** 6))
+    # The doomed college/course cases move through the table 100 students at a time
+    last_moved = [""]
+    college_name = db.execute_query(
+        "SELECT college_name FROM colleges WHERE college_code = %s", (college,), fetch=True
+    )[0]['college_name']
+    course_name = db.execute_query(
+        "SELECT course_name FROM courses WHERE course_code = %s", (course,), fetch=True
+    )[0]['course_name']
+
+    def restore_college():
+        if db.execute_query("SELECT 1 FROM colleges WHERE college_code = %s", (renamed_college,), fetch=True):
+            db.update_college(renamed_college, college, college_name)
+
+    def restore_course():
+        if db.execute_query("SELECT 1 FROM courses WHERE course_code = %s", (renamed_course,), fetch=True):
+            db.update_course(renamed_course, course, course_name, college)
+
+    def rename_college():
+        restore_college()
+        return college, renamed_college, college_name
+
+    def rename_course():
+        restore_course()
+        return course, renamed_course, course_name, college
+
+    def next_students():
+        rows = db.execute_query(
+            "SELECT student_id FROM students WHERE student_id > %s ORDER BY student_id LIMIT 100",
+            (last_moved[0],), fetch=True
+        )
+        if len(rows) < 100:
+            rows = db.execute_query("SELECT student_id FROM students ORDER BY student_id LIMIT 100", fetch=True)
+        ids = [row['student_id'] for row in rows]
+        last_moved[0] = ids[-1]
+        return ids
+
+    def move_students(assignments, values):
+        ids = next_students()
+        db.execute_query(
+            f"UPDATE students SET {assignments} WHERE student_id IN ({', '.join(['%s'] * len(ids))})",
+            values + tuple(ids), tables=('students',)
+        )
+
+    def doomed_college():
+        code = f"Z{next(counter):04d}"[:10]
+        db.add_college(code, f"Doomed College {code}")
+        db.add_course(f"{code}-K", f"Doomed Course {code}", code)
+        move_students("college_code = %s, course_code = %s", (code, f"{code}-K"))
+        return (code,)
+
+    def doomed_course():
+        code = f"ZK{next(counter):04d}"
+        db.add_course(code, f"Doomed Course {code}", college)
+        move_students("course_code = %s", (code,))
+        return (code,)
+
+    def new_student():
+        n = next(counter)
+        return ((_bench_id(2099, n), "BENCH", "STUDENT", 20, "Male", "1st", college, course),)
+
+    def existing_student():
+        student_id = _bench_id(2099, next(counter))
+        db.add_student((student_id, "BENCH", "STUDENT", 20, "Male", "1st", college, course))
+        return student_id, (student_id, "BENCHED", "STUDENT", 21, "Female", "2nd", college, course)
+
+    def removable_student():
+        student_id = _bench_id(2098, next(counter))
+        db.add_student((student_id, "BENCH", "STUDENT", 20, "Male", "1st", college, course))
+        return (student_id,)
+
+    def student_batch():
+        start = next(counter)
+        for _ in range(batch_size):
+            next(counter)
+        return ([
+            (_bench_id(2097, start + i), "BENCH", "BATCH", 20,
+             "Others", "5+", college, course)
+            for i in range(batch_size)
+        ],)
+
+    return [
+        ("update_college", "rename", rename_college, db.update_college, restore_college),
+        ("update_course", "rename", rename_course, db.update_course, restore_course),
+        ("delete_college", "100 students", doomed_college, db.delete_college, None),
+        ("delete_course", "100 students", doomed_course, db.delete_course, None),
+        ("add_student", "single", new_student, db.add_student, None),
+        ("update_student", "single", existing_student, db.update_student, None),
+        ("delete_student", "single", removable_student, db.delete_student, None),
+        ("add_students", f"batch of {batch_size}", student_batch, db.add_students, None),
+    ]
@@ -0,0 +1,77 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.10
+
+Exits with status 1 when any case got slower by more than the threshold
+(and by more than --min-delta-ms, so sub-millisecond noise is ignored).
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r['size'], r['method'], r['case']): r for r in report['results']}
+
+
+def compare(baseline, current, metric="median_ms", threshold=0.10, min_delta_ms=0.5):
+    """Return (regressions, improvements, missing) lists of result pairs"""
+    regressions = []
+    improvements = []
+    missing = sorted(key for key in baseline if key not in current)
+    for key, new in current.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        before, after = old[metric], new[metric]
+        delta = after - before
+        ratio = after / before if before else float("inf")
+        if abs(delta) < min_delta_ms:
+            continue
+        if ratio > 1 + threshold:
+            regressions.append((key, before, after, ratio))
+        elif ratio < 1 - threshold:
+            improvements.append((key, before, after, ratio))
+    regressions.sort(key=lambda item: item[3], reverse=True)
+    improvements.sort(key=lambda item: item[3])
+    return regressions, improvements, missing
+
+
+def _print_rows(title, rows, limit):
+    if not rows:
+        return
+    print(f"{title} ({len(rows)}):")
+    for (size, method, case), before, after, ratio in rows[:limit]:
+        print(f"  {size:>9} {method:<28} {before:>10.3f} -> {after:>10.3f} ms  x{ratio:.2f}  {case}")
+    if len(rows) > limit:
+        print(f"  ... {len(rows) - limit} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="median_ms", choices=["median_ms", "min_ms", "p95_ms", "mean_ms"])
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore changes smaller than this many milliseconds (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=25, help="rows to print per section")
+    args = parser.parse_args(argv)
+
+    regressions, improvements, missing = compare(
+        _load(args.baseline), _load(args.current), args.metric, args.threshold, args.min_delta_ms
+    )
+    _print_rows("Regressions", regressions, args.limit)
+    _print_rows("Improvements", improvements, args.limit)
+    if missing:
+        print(f"{len(missing)} baseline cases were not run this time")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Measure how much memory each row_factory representation holds per student row.
+
+    python -m benchmarks.row_memory --rows 1000000
+
+benchmarks/results/row_memory.txt holds a recorded run.
+
+Values (IDs, names) are created once and shared by every representation, so
+the numbers are the per-row container cost that row_factory controls.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from database.models import Student, row_builder
+from utils.datagen import StudentGenerator
+
+COLUMNS = Student.__slots__[:-1]
+REPRESENTATIONS = (("dict", None), ("namedtuple", "namedtuple"), ("tuple", tuple), ("Student", Student))
+
+
+def _source_rows(count, seed):
+    # Only memory is measured, so a century of enrollment years is fine here
+    generator = StudentGenerator(seed, end_year=2025, max_years=150)
+    colleges = dict(generator.colleges)
+    courses = {code: name for code, name, _ in generator.courses}
+    rows = []
+    for batch in generator.students(count):
+        for row in batch:
+            # The student view adds enrollment_year and the two joined names
+            rows.append(list(row) + [int(row[0][:4]), colleges[row[6]], courses[row[7]]])
+    return rows
+
+
+def measure(source, row_factory):
+    build = row_builder(COLUMNS, row_factory)
+    if row_factory is tuple:
+        build = tuple
+    gc.collect()
+    tracemalloc.start()
+    rows = [build(values) for values in source]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare row representation memory")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    source = _source_rows(args.rows, args.seed)
+    baseline = None
+    print(f"{'row_factory':<12} {'MiB':>9} {'bytes/row':>10} {'vs dict':>8}")
+    for name, row_factory in REPRESENTATIONS:
+        used = measure(source, row_factory)
+        baseline = baseline or used
+        print(f"{name:<12} {used / 2 ** 20:>9.1f} {used / len(source):>10.1f} {used / baseline:>7.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
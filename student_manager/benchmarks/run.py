@@ -0,0 +1,166 @@
+"""Time MySQLDatabase methods against seeded databases of several sizes.
+
+Run from the student_manager directory against a scratch database (it is
+wiped and reseeded for every size):
+
+    python -m benchmarks.run --sizes 10000,100000,1000000 --output before.json
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from config import DB_CONFIG, POOL_CONFIG, DATA_DIR
+from database.mysql_db import ConnectionPool, MySQLDatabase
+from database.setup import setup_database
+from benchmarks.seed import seed_database
+from benchmarks.cases import filter_cases, read_methods, reference_cases, write_cases
+
+
+def _time_call(fn, args, repeat, warmup, setup=None, before=None):
+    timings = []
+    result = None
+    for i in range(warmup + repeat):
+        call_args = setup() if setup else args
+        if before:
+            before()
+        started = time.perf_counter()
+        result = fn(*call_args)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            timings.append(elapsed)
+    return timings, result
+
+
+def _summarize(size, method, case, timings, result):
+    timings.sort()
+    rows = len(result) if isinstance(result, list) else None if isinstance(result, bool) else result
+    return {
+        'size': size,
+        'method': method,
+        'case': case,
+        'median_ms': round(statistics.median(timings), 4),
+        'min_ms': round(timings[0], 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'runs': len(timings),
+        'rows': rows
+    }
+
+
+def run_size(db, size, args, log):
+    log(f"Seeding {size} students...")
+    seed_database(db, size, seed=args.seed)
+    if not args.no_trigram:
+        db.build_trigram_index()
+    else:
+        db.trigram_index = None
+
+    sample = db.execute_query(
+        "SELECT * FROM students ORDER BY student_id LIMIT 1 OFFSET %s", (size // 2,), fetch=True
+    )[0]
+    # Each timed call must reach MySQL, not the query cache
+    clear_cache = db.cache.invalidate
+    results = []
+
+    def selected(method):
+        return not args.methods or any(name in method for name in args.methods)
+
+    methods = [method for method in read_methods(db, args.page_size, args.full_scan) if selected(method[0])]
+    if methods:
+        cases = list(filter_cases(sample))
+        if args.max_cases and len(cases) > args.max_cases:
+            # Evenly spaced, so the same subset is picked on every run
+            stride = len(cases) / args.max_cases
+            cases = [cases[int(i * stride)] for i in range(args.max_cases)]
+        log(f"  {len(cases)} filter/sort cases x {len(methods)} methods")
+        for case, filters in cases:
+            for name, fn, uses_sort in methods:
+                if not uses_sort and 'sort_by' in filters:
+                    continue
+                timings, result = _time_call(fn, (filters,), args.repeat, args.warmup, before=clear_cache)
+                results.append(_summarize(size, name, case, timings, result))
+
+    for method, case, setup, fn, teardown in reference_cases(db, sample) + write_cases(db, sample):
+        if not selected(method):
+            continue
+        log(f"  {method} ({case})")
+        timings, result = _time_call(fn, (), args.repeat, args.warmup, setup=setup, before=clear_cache)
+        if teardown:
+            teardown()
+        results.append(_summarize(size, method, case, timings, result))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MySQLDatabase methods")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated student counts to seed (default: %(default)s)")
+    parser.add_argument("--database", default=f"{DB_CONFIG['database']}_bench",
+                        help="scratch database to create and wipe (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per case")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the data set")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--max-cases", type=int, default=200,
+                        help="time an evenly spaced subset of this many filter/sort cases, 0 for all of them "
+                             "(default: %(default)s)")
+    parser.add_argument("--methods", nargs="*", help="only run methods whose name contains one of these")
+    parser.add_argument("--full-scan", action="store_true", help="also time get_students (every matching row)")
+    parser.add_argument("--no-trigram", action="store_true", help="benchmark without the in-memory trigram index")
+    parser.add_argument("--output", help="JSON file to write (default: data/benchmarks/bench-<timestamp>.json)")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.database == DB_CONFIG['database']:
+        parser.error("refusing to benchmark against the application database; pick a scratch --database")
+
+    log = (lambda message: None) if args.quiet else (lambda message: print(message, file=sys.stderr))
+    config = dict(DB_CONFIG, database=args.database)
+    if not setup_database(config):
+        return 1
+
+    pool = ConnectionPool(config, **POOL_CONFIG)
+    db = MySQLDatabase(pool)
+    try:
+        version = db.execute_query("SELECT VERSION() AS version", fetch=True)
+        results = []
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        for size in sizes:
+            results.extend(run_size(db, size, args, log))
+    finally:
+        pool.close()
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mysql': version[0]['version'] if version else None,
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'max_cases': args.max_cases,
+            'trigram_index': not args.no_trigram
+        },
+        'results': results
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(os.path.join(DATA_DIR, "benchmarks"), exist_ok=True)
+        output = os.path.join(DATA_DIR, "benchmarks", f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    log(f"Wrote {len(results)} results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+from utils.datagen import StudentGenerator, load_database
+
+# Fixed so a given seed produces the same IDs whatever year the benchmark runs in
+END_YEAR = 2025
+# Enough enrollment years for the 1M tier (101 are needed); realism matters less than volume here
+MAX_YEARS = 150
+
+
+def seed_database(db, students, seed=0, batch_size=5000):
+    """Replace all rows with a deterministic data set of the given size"""
+    db.execute_query("DELETE FROM students", tables=('students',))
+    db.execute_query("DELETE FROM courses", tables=('courses',))
+    db.execute_query("DELETE FROM colleges", tables=('colleges',))
+    return load_database(db, StudentGenerator(seed, END_YEAR, MAX_YEARS), students, batch_size)
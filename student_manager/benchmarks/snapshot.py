@@ -0,0 +1,81 @@
+"""Compare StudentSnapshot against SQLite for the main table's queries.
+
+    python -m benchmarks.snapshot --rows 1000000 --path /tmp/snapshot_bench.db
+
+The SQLite file at --path is wiped and reseeded. Each query is timed on a
+cold ordering (first page) and on the next page, which the snapshot
+answers from its cached ordering, then through SQL (page plus count).
+benchmarks/results/snapshot.txt holds a recorded run.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from database.snapshot import HAVE_NUMPY, StudentSnapshot
+from database.sqlite_db import SQLiteDatabase, SQLitePool
+from utils.datagen import StudentGenerator, load_database
+
+QUERIES = (
+    ("sort by last name", {'sort_by': 'last_name'}),
+    ("female, by age desc", {'gender': 'Female', 'sort_by': 'age', 'sort_order': 'Descending'}),
+    ("last name contains 'ab'", {'search_last_name': 'ab', 'search_mode': 'contains'}),
+    ("college CCS, 2nd year", {'college': 'CCS', 'year_level': '2nd'}),
+)
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the columnar snapshot against SQLite")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (median is reported)")
+    parser.add_argument("--path", required=True, help="scratch SQLite file to create and wipe")
+    args = parser.parse_args(argv)
+    if not HAVE_NUMPY:
+        parser.error("the snapshot needs NumPy")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.path + suffix):
+            os.remove(args.path + suffix)
+    pool = SQLitePool(args.path)
+    db = SQLiteDatabase(pool)
+    try:
+        db.migrate()
+        # Only the row count matters here, so let the IDs span as many years as they need
+        load_database(db, StudentGenerator(args.seed, end_year=2025, max_years=150), args.rows)
+
+        snapshot = StudentSnapshot(db)
+        started = time.perf_counter()
+        snapshot.build()
+        print(f"{args.rows:,} rows: build {time.perf_counter() - started:.2f} s, "
+              f"arrays {snapshot.nbytes() / 2 ** 20:.1f} MiB")
+
+        print(f"{'query':<26} {'snapshot':>10} {'next page':>10} {'sqlite':>10}")
+        for name, filters in QUERIES:
+            def cold():
+                snapshot._order_cache = None
+                snapshot.fetch(filters, 1)
+            cold_ms = _median_ms(cold, args.repeat)
+            warm_ms = _median_ms(lambda: snapshot.fetch(filters, 2), args.repeat)
+            sql_ms = _median_ms(
+                lambda: (db.get_students_page(filters, 1), db.count_students(filters), db.cache.invalidate()),
+                args.repeat
+            )
+            print(f"{name:<26} {cold_ms:>8.1f}ms {warm_ms:>8.2f}ms {sql_ms:>8.1f}ms")
+    finally:
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
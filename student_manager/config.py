@@ -12,7 +12,63 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 'mysql' uses DB_CONFIG; 'sqlite' keeps everything in a local file (single-seat installs)
+DB_BACKEND = 'mysql'
+
+SQLITE_CONFIG = {
+    'path': os.path.join(DATA_DIR, 'student_management.db'),
+    'pool_size': 4,
+    'busy_timeout': 5000,
+    'checkout_timeout': 10,
+    'statement_cache_size': 64
+}
+
 WINDOW_TITLE = "Student Management System"
 WINDOW_SIZE = "1250x500"
 THEME_COLOR = "#800000"
-ACCENT_COLOR = "#7d6a69"
\ No newline at end of file
+ACCENT_COLOR = "#7d6a69"
+
+POOL_CONFIG = {
+    'min_size': 1,
+    'max_size': 5,
+    'idle_timeout': 300,
+    'health_check_interval': 30,
+    'checkout_timeout': 10,
+    'statement_cache_size': 64
+}
+
+IMPORT_BATCH_SIZE = 1000
+
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_CANDIDATE_LIMIT = 2000
+
+TRIGRAM_INDEX_ENABLED = True
+TRIGRAM_MAX_CANDIDATES = 5000
+
+# Columnar in-memory copy of the students table (needs NumPy); the table
+# view filters and sorts it instead of querying the database
+STUDENT_SNAPSHOT_ENABLED = False
+
+# Student table pages kept in memory, and whether the pages either side of
+# the one shown are loaded in the background
+PAGE_CACHE_SIZE = 32
+PAGE_PREFETCH_ENABLED = True
+
+# Exact student counts cached per filter set; results the planner estimates
+# at estimate_min_rows or more show the estimate until the exact count is in
+COUNT_CONFIG = {
+    'max_entries': 128,
+    'estimate_min_rows': 100000
+}
+
+QUERY_CACHE_CONFIG = {
+    'max_entries': 256,
+    'ttl': 300
+}
+
+QUERY_STATS_CONFIG = {
+    'slow_query_ms': 200,
+    'log_path': os.path.join(DATA_DIR, 'slow_queries.log'),
+    'max_bytes': 1_000_000,
+    'backup_count': 3
+}
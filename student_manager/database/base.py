@@ -0,0 +1,529 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from config import (DB_BACKEND, QUERY_CACHE_CONFIG, QUERY_STATS_CONFIG, COUNT_CONFIG,
+                    IMPORT_BATCH_SIZE, TRIGRAM_MAX_CANDIDATES)
+from database.cache import QueryCache
+from database.counts import CountService
+from database.instrumentation import QueryStats, estimate_bytes
+from database.importer import StudentImporter
+from database.exporter import export_students
+from database.trigram import TrigramIndex
+from database.snapshot import HAVE_NUMPY, StudentSnapshot
+from database.query_builder import (student_filter, student_sort, student_sql, seek_clause, SEARCH_COLUMNS,
+                                    college_sql, course_sql, prefix_pattern, contains_pattern,
+                                    COURSE_SEARCH_COLUMNS, PREFIX_SEARCH_COLUMNS)
+from database.models import KeyedRows, build_rows
+
+logger = logging.getLogger("student_manager.database")
+
+
+def _column_names(cursor):
+    return tuple(column[0] for column in cursor.description)
+
+
+class Database(ABC):
+    """Queries shared by every storage backend.
+
+    Subclasses provide a pool with connection()/close()/max_size, set Error
+    to the driver's exception base and dialect for the query builder, and
+    implement connect(), migrate() and setup(). SQL is written with %s
+    placeholders.
+
+    Fetching methods take a row_factory: None for dicts (the default),
+    tuple, "namedtuple", or a model class from database.models.
+    """
+
+    Error = Exception
+    dialect = None
+
+    def __init__(self, pool=None):
+        self._owns_pool = pool is None
+        self.pool = pool
+        self.cache = QueryCache(**QUERY_CACHE_CONFIG)
+        self.stats = QueryStats(**QUERY_STATS_CONFIG)
+        self.counts = CountService(self, **COUNT_CONFIG)
+        self.write_version = 0
+        self.trigram_index = None
+        self.snapshot = None
+        if self.pool is None:
+            self.connect()
+
+    @abstractmethod
+    def connect(self):
+        """Open self.pool; on failure report it and leave the pool None"""
+
+    @abstractmethod
+    def migrate(self):
+        """Bring an existing database up to the latest schema"""
+
+    @abstractmethod
+    def setup(self):
+        """Create the database and tables from scratch"""
+
+    def _connection(self):
+        """Check out a pooled connection; raises Error when no pool could be opened"""
+        if self.pool is None:
+            raise self.Error("No open database connection")
+        return self.pool.connection()
+
+    def _sql(self, query):
+        """Rewrite a %s-style query for the driver"""
+        return query
+
+    def _cursor(self, connection, streaming=False):
+        return connection.cursor()
+
+    def _close_stream(self, connection, cursor):
+        cursor.close()
+
+    def _explain(self, connection, query, params):
+        return None
+
+    def execute_query(self, query, params=None, fetch=False, tables=None, prepared=False, label=None,
+                      row_factory=None):
+        # Public methods pass their own name; ad hoc queries are grouped together
+        label = label or "execute_query"
+        cursor = None
+        prepared = prepared and fetch
+        started = time.perf_counter()
+        try:
+            with self._connection() as connection:
+                try:
+                    if prepared:
+                        columns, rows = self._execute_prepared(connection, query, params)
+                        self._observe(connection, label, query, params, started, rows)
+                        return build_rows(columns, rows, row_factory)
+
+                    cursor = self._cursor(connection)
+                    cursor.execute(self._sql(query), params or ())
+
+                    if fetch:
+                        rows = cursor.fetchall()
+                        self._observe(connection, label, query, params, started, rows)
+                        return build_rows(_column_names(cursor), rows, row_factory)
+
+                    connection.commit()
+                    # Committed: invalidate before anything else can fail
+                    self._on_write(*(tables or ()))
+                    self._observe(connection, label, query, params, started, rowcount=cursor.rowcount)
+                    return True
+                finally:
+                    if cursor:
+                        cursor.close()
+
+        except self.Error as e:
+            self.stats.record_error(label)
+            logger.error("Error executing query (%s): %s", label, e)
+            return False
+
+    def _observe(self, connection, label, query, params, started, rows=None, rowcount=0):
+        elapsed = time.perf_counter() - started
+        count = len(rows) if rows is not None else max(rowcount, 0)
+        self.stats.record(label, elapsed, count, estimate_bytes(rows) if rows else 0)
+        if self.stats.is_slow(elapsed):
+            self.stats.log_slow(label, query, params, elapsed, count, self._explain(connection, query, params))
+
+    def _execute_prepared(self, connection, query, params):
+        """Return (column names, row tuples)"""
+        cursor = self._cursor(connection)
+        try:
+            cursor.execute(self._sql(query), tuple(params or ()))
+            return _column_names(cursor), cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _iter_query(self, query, params=None, batch_size=5000, row_factory=tuple, label="_iter_query"):
+        with self._connection() as connection:
+            cursor = self._cursor(connection, streaming=True)
+            started = time.perf_counter()
+            count = 0
+            nbytes = 0
+            try:
+                cursor.execute(self._sql(query), params or ())
+                columns = _column_names(cursor)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    count += len(rows)
+                    nbytes += estimate_bytes(rows)
+                    yield from build_rows(columns, rows, row_factory)
+            finally:
+                self._close_stream(connection, cursor)
+                # Includes time the consumer spent between batches
+                self.stats.record(label, time.perf_counter() - started, count, nbytes)
+
+    def _cached_query(self, query, params=None, tables=(), prepared=False, label="cached_query"):
+        key = (query, tuple(params or ()))
+        found, rows = self.cache.get(key)
+        if not found:
+            generation = self.cache.generation(tables)
+            rows = self.execute_query(query, params, fetch=True, prepared=prepared, label=label)
+            if rows is False:
+                return False
+            self.cache.put(key, rows, tables, generation)
+        return list(rows)
+
+    def _on_write(self, *tables):
+        """Invalidate cached results for the tables a write touched (all tables if none given)"""
+        if not tables or 'students' in tables:
+            self.write_version += 1
+        self.cache.invalidate(tables or None)
+
+    def get_colleges(self):
+        query = "SELECT * FROM colleges ORDER BY college_name"
+        return self._cached_query(query, tables=('colleges',), label="get_colleges")
+
+    def get_courses_by_college(self, college_code):
+        query = """
+        SELECT course_code, course_name
+        FROM courses
+        WHERE college_code = %s
+        ORDER BY course_name
+        """
+        return self._cached_query(query, (college_code,), ('courses',), label="get_courses_by_college")
+
+    def get_college_page(self, search=None, sort_by="college_code", descending=False, limit=200, offset=0):
+        """Colleges with their course counts, searched, ordered and paged in SQL"""
+        query = college_sql("page", bool(search), sort_by, "DESC" if descending else "ASC")
+        params = [contains_pattern(search)] * 2 if search else []
+        return self._cached_query(query, params + [limit, offset], ('colleges', 'courses'), prepared=True,
+                                  label="get_college_page")
+
+    def count_colleges(self, search=None):
+        """Number of matching colleges, or None if the query failed"""
+        params = [contains_pattern(search)] * 2 if search else []
+        result = self._cached_query(college_sql("count", bool(search)), params, ('colleges',), prepared=True,
+                                    label="count_colleges")
+        if not result:
+            return None
+        return result[0]['total']
+
+    def _course_filter(self, college_code, search, search_by):
+        """Return (search column or None, params) for course_sql"""
+        params = [college_code] if college_code else []
+        if not search or search_by not in COURSE_SEARCH_COLUMNS:
+            return None, params
+        pattern = prefix_pattern if search_by in PREFIX_SEARCH_COLUMNS else contains_pattern
+        return search_by, params + [pattern(search)]
+
+    def get_course_page(self, college_code=None, search=None, search_by="course_code", sort_by="course_code",
+                        descending=False, limit=200, offset=0):
+        """Courses with their college names, filtered, ordered and paged in SQL"""
+        search_column, params = self._course_filter(college_code, search, search_by)
+        query = course_sql("page", bool(college_code), search_column, sort_by, "DESC" if descending else "ASC")
+        return self._cached_query(query, params + [limit, offset], ('courses', 'colleges'), prepared=True,
+                                  label="get_course_page")
+
+    def count_courses(self, college_code=None, search=None, search_by="course_code"):
+        """Number of matching courses, or None if the query failed"""
+        search_column, params = self._course_filter(college_code, search, search_by)
+        result = self._cached_query(course_sql("count", bool(college_code), search_column), params,
+                                    ('courses',), prepared=True, label="count_courses")
+        if not result:
+            return None
+        return result[0]['total']
+
+    def get_enrollment_years(self):
+        query = "SELECT DISTINCT enrollment_year FROM students ORDER BY enrollment_year DESC"
+        rows = self._cached_query(query, tables=('students',), label="get_enrollment_years") or []
+        return [row['enrollment_year'] for row in rows if row['enrollment_year']]
+
+    def get_course_colleges(self):
+        query = "SELECT course_code, college_code FROM courses"
+        return self._cached_query(query, tables=('courses',), label="get_course_colleges")
+
+    def get_courses(self):
+        query = "SELECT course_code, course_name, college_code FROM courses ORDER BY course_name"
+        return self._cached_query(query, tables=('courses',), label="get_courses")
+
+    def get_all_courses(self):
+        query = """
+        SELECT c.course_code, c.course_name, co.college_name
+        FROM courses c
+        JOIN colleges co ON c.college_code = co.college_code
+        ORDER BY co.college_name, c.course_name
+        """
+        return self._cached_query(query, tables=('courses', 'colleges'), label="get_all_courses")
+
+    def _student_filter(self, filters):
+        return student_filter(filters, self._trigram_candidates)
+
+    def _student_sql(self, kind, clauses, keys=(), direction="ASC", seek=None, backward=False):
+        return student_sql(kind, clauses, keys, direction, seek, backward, self.dialect)
+
+    def _trigram_candidates(self, column, text, mode):
+        index = self.trigram_index
+        if mode not in ("contains", "fuzzy") or index is None or not index.ready:
+            return None
+        field = column.split(".")[1]
+        if mode == "fuzzy":
+            candidates = index.similar(field, text)
+        else:
+            candidates = index.contains(field, text)
+        if candidates is None or len(candidates) > TRIGRAM_MAX_CANDIDATES:
+            return None
+        return candidates
+
+    def get_students(self, filters=None, row_factory=None):
+        clauses, params = self._student_filter(filters)
+        query = self._student_sql("rows", clauses, *student_sort(filters))
+        return self.execute_query(query, params, fetch=True, prepared=True, label="get_students",
+                                  row_factory=row_factory)
+
+    def iter_students(self, filters=None, batch_size=1000, row_factory=None):
+        """Stream students through an unbuffered cursor instead of fetching them all"""
+        clauses, params = self._student_filter(filters)
+        query = self._student_sql("rows", clauses, *student_sort(filters))
+        return self._iter_query(query, params, batch_size, row_factory, label="iter_students")
+
+    def export_students(self, path, filters=None, progress=None):
+        return export_students(self, path, filters, progress)
+
+    def get_students_page(self, filters=None, page=1, page_size=20, row_factory=None):
+        """Fetch a single page of students, letting the database apply the LIMIT"""
+        clauses, params = self._student_filter(filters)
+        query = self._student_sql("page", clauses, *student_sort(filters))
+        params += [page_size, (max(page, 1) - 1) * page_size]
+        return self.execute_query(query, params, fetch=True, prepared=True, label="get_students_page",
+                                  row_factory=row_factory)
+
+    def count_students(self, filters=None):
+        """Number of matching students, or None if the query failed"""
+        clauses, params = self._student_filter(filters)
+        query = self._student_sql("count", clauses)
+        result = self._cached_query(query, params, ('students',), prepared=True, label="count_students")
+        if not result:
+            return None
+        return result[0]['total']
+
+    def estimate_student_count(self, filters=None):
+        """Row estimate from the planner's statistics, or None.
+
+        Only unfiltered and equality-filtered queries are estimated; search
+        predicates are too selective for the statistics to say much.
+        """
+        if filters and any(filters.get(field) for field in SEARCH_COLUMNS):
+            return None
+        clauses, params = self._student_filter(filters)
+        return self._estimate_rows(clauses, params)
+
+    def _estimate_rows(self, clauses, params):
+        return None
+
+    def get_students_keyset(self, filters=None, after=None, limit=20, offset=0, backward=False, row_factory=None):
+        """Fetch the rows after (or, backward, before) the sort key `after`; each row carries its '_key'.
+
+        row_factory must accept item assignment: None (dicts) or a model.
+        """
+        keys, direction = student_sort(filters)
+        clauses, params = self._student_filter(filters)
+        seek = None
+        if after is not None:
+            seek = tuple(value is None for value in after)
+            _, positions = seek_clause(keys, seek, (direction == "ASC") != backward)
+            params += [after[i] for i in positions]
+        query = self._student_sql("keyset", clauses, keys, direction, seek, backward)
+        params += [limit, offset]
+
+        rows = self.execute_query(query, params, fetch=True, prepared=True, label="get_students_keyset",
+                                  row_factory=KeyedRows(row_factory, len(keys))) or []
+        if backward:
+            rows.reverse()
+        return rows
+
+    def iter_student_keys(self, filters=None, batch_size=5000):
+        """Stream just the sort key of every matching student, in display order"""
+        clauses, params = self._student_filter(filters)
+        query = self._student_sql("keys", clauses, *student_sort(filters))
+        for row in self._iter_query(query, params, batch_size, label="iter_student_keys"):
+            yield tuple(row)
+
+    def add_student(self, student_data):
+        query = """
+        INSERT INTO students
+        (student_id, first_name, last_name, age, gender, year_level, college_code, course_code)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        result = self.execute_query(query, student_data, tables=('students',), label="add_student")
+        if result and self.trigram_index is not None:
+            self.trigram_index.add(*student_data[:3])
+        if result and self.snapshot is not None:
+            self.snapshot.add([student_data])
+        return result
+
+    def add_students(self, rows):
+        """Insert many students in one transaction using a multi-row INSERT"""
+        query = """
+        INSERT INTO students
+        (student_id, first_name, last_name, age, gender, year_level, college_code, course_code)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        cursor = None
+        try:
+            with self._connection() as connection:
+                try:
+                    cursor = self._cursor(connection)
+                    started = time.perf_counter()
+                    cursor.executemany(self._sql(query), rows)
+                    connection.commit()
+                    self.stats.record("add_students", time.perf_counter() - started, len(rows))
+                    self._on_write('students')
+                    if self.trigram_index is not None:
+                        for row in rows:
+                            self.trigram_index.add(*row[:3])
+                    if self.snapshot is not None:
+                        self.snapshot.add(rows)
+                    return True
+                except self.Error as e:
+                    logger.error("Error inserting students: %s", e)
+                    connection.rollback()
+                    return False
+                finally:
+                    if cursor:
+                        cursor.close()
+        except self.Error as e:
+            logger.error("Error inserting students: %s", e)
+            return False
+
+    def import_students(self, path, batch_size=IMPORT_BATCH_SIZE, reject_path=None, progress=None):
+        importer = StudentImporter(self, batch_size=batch_size, progress=progress)
+        return importer.run(path, reject_path)
+
+    def get_student_ids(self):
+        return {row[0] for row in self._iter_query("SELECT student_id FROM students", label="get_student_ids")}
+
+    def update_student(self, old_student_id, student_data):
+        query = """
+        UPDATE students
+        SET student_id = %s, first_name = %s, last_name = %s, age = %s, gender = %s,
+            year_level = %s, college_code = %s, course_code = %s
+        WHERE student_id = %s
+        """
+
+        params = (*student_data, old_student_id)
+        result = self.execute_query(query, params, tables=('students',), label="update_student")
+        if result and self.trigram_index is not None:
+            self.trigram_index.update(old_student_id, *student_data[:3])
+        if result and self.snapshot is not None:
+            self.snapshot.update(old_student_id, student_data)
+        return result
+
+    def delete_student(self, student_id):
+        query = "DELETE FROM students WHERE student_id = %s"
+        result = self.execute_query(query, (student_id,), tables=('students',), label="delete_student")
+        if result and self.trigram_index is not None:
+            self.trigram_index.remove(student_id)
+        if result and self.snapshot is not None:
+            self.snapshot.remove(student_id)
+        return result
+
+    def add_college(self, college_code, college_name):
+        query = "INSERT INTO colleges (college_code, college_name) VALUES (%s, %s)"
+        result = self.execute_query(query, (college_code, college_name), tables=('colleges',), label="add_college")
+        if result and self.snapshot is not None:
+            self.snapshot.put_college(college_code, college_name)
+        return result
+
+    # Foreign keys are ON UPDATE CASCADE / ON DELETE SET NULL, so renaming or
+    # deleting a college or course is one statement: the database rewrites the
+    # referencing courses and students through their indexes in the same transaction.
+
+    def update_college(self, old_code, college_code, college_name):
+        query = "UPDATE colleges SET college_code = %s, college_name = %s WHERE college_code = %s"
+        result = self.execute_query(query, (college_code, college_name, old_code),
+                                    tables=('students', 'courses', 'colleges'), label="update_college")
+        if result and self.snapshot is not None:
+            self.snapshot.rename_college(old_code, college_code, college_name)
+        return result
+
+    def delete_college(self, college_code):
+        query = "DELETE FROM colleges WHERE college_code = %s"
+        result = self.execute_query(query, (college_code,), tables=('students', 'courses', 'colleges'),
+                                    label="delete_college")
+        if result and self.snapshot is not None:
+            self.snapshot.remove_college(college_code)
+        return result
+
+    def add_course(self, course_code, course_name, college_code):
+        query = """
+        INSERT INTO courses (course_code, course_name, college_code)
+        VALUES (%s, %s, %s)
+        """
+        result = self.execute_query(query, (course_code, course_name, college_code), tables=('courses',),
+                                    label="add_course")
+        if result and self.snapshot is not None:
+            self.snapshot.put_course(course_code, course_name)
+        return result
+
+    def update_course(self, old_code, course_code, course_name, college_code):
+        query = """
+        UPDATE courses
+        SET course_code = %s, course_name = %s, college_code = %s
+        WHERE course_code = %s
+        """
+        result = self.execute_query(query, (course_code, course_name, college_code, old_code),
+                                    tables=('students', 'courses'), label="update_course")
+        if result and self.snapshot is not None:
+            self.snapshot.rename_course(old_code, course_code, course_name)
+        return result
+
+    def delete_course(self, course_code):
+        query = "DELETE FROM courses WHERE course_code = %s"
+        result = self.execute_query(query, (course_code,), tables=('students', 'courses'), label="delete_course")
+        if result and self.snapshot is not None:
+            self.snapshot.remove_course(course_code)
+        return result
+
+    def clear_all_students(self):
+        """Delete all student records from the database"""
+        query = "DELETE FROM students"
+        result = self.execute_query(query, tables=('students',), label="clear_all_students")
+        if result and self.trigram_index is not None:
+            self.trigram_index.clear()
+        if result and self.snapshot is not None:
+            self.snapshot.clear()
+        return result
+
+    def build_trigram_index(self):
+        """Build the in-memory name/ID index from a streaming read of the students table"""
+        index = TrigramIndex()
+        self.trigram_index = index
+        index.build(self._iter_query(
+            "SELECT student_id, first_name, last_name FROM students", label="build_trigram_index"
+        ))
+        return index
+
+    def build_snapshot(self):
+        """Load the columnar student snapshot; None when NumPy is not installed"""
+        if not HAVE_NUMPY:
+            print("NumPy is not installed; the student snapshot is disabled")
+            return None
+        snapshot = StudentSnapshot(self)
+        self.snapshot = snapshot
+        snapshot.build()
+        return snapshot
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def query_stats(self):
+        """Latency histograms per call site, with row and byte totals"""
+        return self.stats.summary()
+
+    def close(self):
+        if self.pool and self._owns_pool:
+            self.pool.close()
+
+
+def create_database(backend=None):
+    """Open the backend named by config.DB_BACKEND ('mysql' or 'sqlite')"""
+    backend = backend or DB_BACKEND
+    if backend == "sqlite":
+        from database.sqlite_db import SQLiteDatabase
+        return SQLiteDatabase()
+    if backend == "mysql":
+        from database.mysql_db import MySQLDatabase
+        return MySQLDatabase()
+    raise ValueError(f"Unknown database backend: {backend}")
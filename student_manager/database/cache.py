@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """LRU cache of query results, tagged with the tables each result reads.
+
+    Entries expire after `ttl` seconds; writes invalidate only the entries
+    tagged with a table they touched. A reader takes generation(tables)
+    before it queries and passes it to put(), which drops the result if a
+    write invalidated one of those tables in the meantime.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (True, value) on a hit and (False, None) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def _generation(self, tables):
+        return self._epoch, tuple(self._generations.get(table, 0) for table in tables)
+
+    def generation(self, tables):
+        with self._lock:
+            return self._generation(tables)
+
+    def put(self, key, value, tables, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation(tables):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def invalidate(self, tables=None):
+        """Drop entries reading any of `tables`, or everything when tables is None"""
+        with self._lock:
+            if tables is None:
+                self._epoch += 1
+                self._entries.clear()
+                self._by_table.clear()
+                return
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+
+# Sorting changes the order of a result, not its size
+UNCOUNTED_FILTERS = ('sort_by', 'sort_order')
+
+
+def count_signature(filters):
+    return tuple(sorted((k, v) for k, v in (filters or {}).items() if k not in UNCOUNTED_FILTERS and v))
+
+
+class CountService:
+    """Student counts per filter signature, for the pagination label.
+
+    Exact counts are kept until the next student write (db.write_version).
+    quick() avoids a COUNT(*) where it can: it returns a cached exact count,
+    the snapshot's count, or, for broad queries, the planner's row estimate,
+    leaving the caller to fetch the exact figure with exact() in the background.
+    exact() raises RuntimeError when the count query fails; nothing is cached then.
+    """
+
+    def __init__(self, db, max_entries=128, estimate_min_rows=100000):
+        self.db = db
+        self.max_entries = max_entries
+        self.estimate_min_rows = estimate_min_rows
+        self._exact = OrderedDict()
+        self._estimates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, entries, key):
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or entry[0] != self.db.write_version:
+                return None
+            entries.move_to_end(key)
+            return entry[1]
+
+    def _put(self, entries, key, version, count):
+        with self._lock:
+            if version != self.db.write_version:
+                return
+            entries[key] = (version, count)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def cached(self, filters):
+        """The exact count if it is known, else None"""
+        return self._get(self._exact, count_signature(filters))
+
+    def exact(self, filters):
+        snapshot = self.db.snapshot
+        if snapshot is not None and snapshot.ready:
+            return snapshot.count_students(filters)
+
+        key = count_signature(filters)
+        count = self._get(self._exact, key)
+        if count is None:
+            version = self.db.write_version
+            count = self.db.count_students(filters)
+            if count is None:
+                # Not cached: a failed count must not read as an empty result
+                raise RuntimeError("Could not count students")
+            self._put(self._exact, key, version, count)
+        return count
+
+    def estimate(self, filters):
+        """The planner's row estimate, or None when the backend has none for these filters"""
+        key = count_signature(filters)
+        with self._lock:
+            entry = self._estimates.get(key)
+        if entry is not None and entry[0] == self.db.write_version:
+            return entry[1]
+
+        version = self.db.write_version
+        estimate = self.db.estimate_student_count(filters)
+        self._put(self._estimates, key, version, estimate)
+        return estimate
+
+    def quick(self, filters):
+        """Return (count, exact): exact unless a large estimate was good enough"""
+        count = self.cached(filters)
+        if count is not None:
+            return count, True
+
+        snapshot = self.db.snapshot
+        if snapshot is None or not snapshot.ready:
+            estimate = self.estimate(filters)
+            if estimate is not None and estimate >= self.estimate_min_rows:
+                return estimate, False
+        return self.exact(filters), True
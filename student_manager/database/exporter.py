@@ -0,0 +1,33 @@
+import csv
+import gzip
+from database.importer import STUDENT_COLUMNS
+
+EXPORT_COLUMNS = STUDENT_COLUMNS + ("college_name", "course_name")
+
+
+def export_students(db, path, filters=None, progress=None, progress_every=1000):
+    """Write the filtered student view to CSV (gzip-compressed for *.gz) row by row.
+
+    progress, if given, is called with the number of rows written every
+    progress_every rows and once at the end; returning False cancels the export.
+    """
+    opener = gzip.open if path.lower().endswith(".gz") else open
+    written = 0
+    with opener(path, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        rows = db.iter_students(filters)
+        try:
+            for student in rows:
+                writer.writerow([
+                    student[col] if student[col] is not None else "" for col in EXPORT_COLUMNS
+                ])
+                written += 1
+                if progress and written % progress_every == 0 and progress(written) is False:
+                    break
+        finally:
+            rows.close()
+
+    if progress:
+        progress(written)
+    return written
@@ -0,0 +1,162 @@
+import csv
+import os
+from utils.formats import GENDERS, YEAR_LEVELS, is_valid_id_format, is_text_only, is_valid_age
+
+STUDENT_COLUMNS = (
+    "student_id", "first_name", "last_name", "age",
+    "gender", "year_level", "college_code", "course_code"
+)
+HEADER_ALIASES = {
+    "id#": "student_id",
+    "id": "student_id",
+    "college": "college_code",
+    "course": "course_code"
+}
+
+
+def _normalize_header(name):
+    name = name.strip().lower().replace(" ", "_")
+    return HEADER_ALIASES.get(name, name)
+
+
+def _detect_delimiter(path, sample):
+    if path.lower().endswith(".tsv"):
+        return "\t"
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",\t;").delimiter
+    except csv.Error:
+        return ","
+
+
+def _code(value):
+    # Accept both bare codes and the "CODE - Name" form the comboboxes display
+    return value.split(" - ")[0].strip().upper()
+
+
+class StudentImporter:
+    """Streams a CSV/TSV file into the students table in batched transactions."""
+
+    def __init__(self, db, batch_size=1000, progress=None):
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.progress = progress
+        self.inserted = 0
+        self.rejected = 0
+
+    def _load_lookups(self):
+        self.college_codes = {c['college_code'] for c in self.db.get_colleges() or []}
+        self.course_colleges = {
+            c['course_code']: c['college_code'] for c in self.db.get_course_colleges() or []
+        }
+        self.seen_ids = self.db.get_student_ids()
+
+    def _validate(self, record):
+        values = {col: (record.get(col) or "").strip() for col in STUDENT_COLUMNS}
+        if not all(values.values()):
+            missing = [col for col, value in values.items() if not value]
+            return None, f"missing {', '.join(missing)}"
+
+        student_id = values['student_id']
+        if not is_valid_id_format(student_id):
+            return None, "ID# must be in the format YYYY-NNNN"
+        if student_id in self.seen_ids:
+            return None, "student ID already exists"
+
+        first_name = values['first_name'].upper()
+        last_name = values['last_name'].upper()
+        if not is_text_only(first_name) or not is_text_only(last_name):
+            return None, "names must not contain numbers"
+
+        if not is_valid_age(values['age']):
+            return None, "age must be a number between 1 and 120"
+
+        gender = values['gender'].capitalize()
+        if gender not in GENDERS:
+            return None, f"unknown gender '{values['gender']}'"
+
+        year_level = values['year_level'].lower()
+        if year_level not in YEAR_LEVELS:
+            return None, f"unknown year level '{values['year_level']}'"
+
+        college_code = _code(values['college_code'])
+        if college_code not in self.college_codes:
+            return None, f"unknown college '{college_code}'"
+
+        course_code = _code(values['course_code'])
+        if course_code not in self.course_colleges:
+            return None, f"unknown course '{course_code}'"
+        if self.course_colleges[course_code] != college_code:
+            return None, f"course '{course_code}' does not belong to college '{college_code}'"
+
+        return (student_id, first_name, last_name, int(values['age']), gender,
+                year_level, college_code, course_code), None
+
+    def _flush(self, batch, reject):
+        if not batch:
+            return
+        if self.db.add_students([row for row, _ in batch]):
+            self.inserted += len(batch)
+        else:
+            # Retry one by one so a single bad row doesn't sink the whole batch
+            for row, record in batch:
+                if self.db.add_students([row]):
+                    self.inserted += 1
+                else:
+                    self.seen_ids.discard(row[0])
+                    reject(record, "rejected by the database")
+        batch.clear()
+        if self.progress:
+            self.progress(self.inserted, self.rejected)
+
+    def run(self, path, reject_path=None):
+        reject_path = reject_path or os.path.splitext(path)[0] + ".rejected.csv"
+        self._load_lookups()
+        reject_file = None
+        reject_writer = None
+
+        def reject(record, reason):
+            nonlocal reject_file, reject_writer
+            if reject_writer is None:
+                reject_file = open(reject_path, "w", newline="", encoding="utf-8")
+                reject_writer = csv.writer(reject_file)
+                reject_writer.writerow(["line"] + fieldnames + ["reason"])
+            reject_writer.writerow([record['_line']] + [record.get(f, "") for f in fieldnames] + [reason])
+            self.rejected += 1
+
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                delimiter = _detect_delimiter(path, f.read(4096))
+                f.seek(0)
+                reader = csv.reader(f, delimiter=delimiter)
+                fieldnames = next(reader, [])
+                columns = [_normalize_header(name) for name in fieldnames]
+
+                batch = []
+                for line_no, values in enumerate(reader, start=2):
+                    if not any(values):
+                        continue
+                    record = dict(zip(columns, values))
+                    record['_line'] = line_no
+                    for name, value in zip(fieldnames, values):
+                        record.setdefault(name, value)
+
+                    row, reason = self._validate(record)
+                    if row is None:
+                        reject(record, reason)
+                        continue
+
+                    self.seen_ids.add(row[0])
+                    batch.append((row, record))
+                    if len(batch) >= self.batch_size:
+                        self._flush(batch, reject)
+
+                self._flush(batch, reject)
+        finally:
+            if reject_file:
+                reject_file.close()
+
+        return {
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'reject_path': reject_path if self.rejected else None
+        }
@@ -0,0 +1,154 @@
+import logging
+import threading
+from bisect import bisect_left
+from logging.handlers import RotatingFileHandler
+
+# Upper bounds of the latency buckets, in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def params_shape(params):
+    """Describe params by type only, e.g. "str, int x3", so logs never hold student data"""
+    if not params:
+        return "()"
+    runs = []
+    for value in params:
+        name = type(value).__name__
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return ", ".join(name if count == 1 else f"{name} x{count}" for name, count in runs)
+
+
+def estimate_bytes(rows):
+    """Rough payload size of fetched rows (text length for strings, 8 bytes otherwise)"""
+    total = 0
+    for row in rows:
+        for value in (row.values() if isinstance(row, dict) else row):
+            if isinstance(value, (str, bytes, bytearray)):
+                total += len(value)
+            elif value is not None:
+                total += 8
+    return total
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+
+    def add(self, elapsed_ms, rows=0, nbytes=0):
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.bytes += nbytes
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls"""
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(float(bound), round(self.max_ms, 3))
+        return self.max_ms
+
+    def summary(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'buckets': dict(zip([f"<={b}ms" for b in LATENCY_BUCKETS_MS] + ["slower"], self.buckets))
+        }
+
+
+class QueryStats:
+    """Per-label latency histograms plus a rotating slow-query log.
+
+    Labels name the calling method (get_students, update_college, ...).
+    Queries slower than slow_query_ms are written to log_path with their
+    parameter shape and EXPLAIN output; the log file is only opened once
+    the first slow query shows up.
+    """
+
+    def __init__(self, slow_query_ms=200, log_path=None, max_bytes=1_000_000, backup_count=3):
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._logger = None
+
+    def _histogram(self, label):
+        histogram = self._histograms.get(label)
+        if histogram is None:
+            histogram = self._histograms.setdefault(label, LatencyHistogram())
+        return histogram
+
+    def record(self, label, elapsed, rows=0, nbytes=0):
+        with self._lock:
+            self._histogram(label).add(elapsed * 1000, rows, nbytes)
+
+    def record_error(self, label):
+        with self._lock:
+            self._histogram(label).errors += 1
+
+    def is_slow(self, elapsed):
+        return self.slow_query_ms is not None and elapsed * 1000 >= self.slow_query_ms
+
+    def log_slow(self, label, query, params, elapsed, rows=0, explain=None):
+        # The log is diagnostics only: a missing or unwritable file must not fail the query
+        try:
+            logger = self._slow_logger()
+        except OSError:
+            return
+        if logger is None:
+            return
+        lines = [
+            f"{label}: {elapsed * 1000:.1f} ms, {rows} rows",
+            f"  sql: {' '.join(query.split())}",
+            f"  params: ({params_shape(params)})"
+        ]
+        if explain:
+            lines.append("  explain:")
+            lines.extend(f"    {row}" for row in explain)
+        logger.warning("\n".join(lines))
+
+    def _slow_logger(self):
+        if self._logger is None and self.log_path:
+            logger = logging.getLogger("student_manager.slow_queries")
+            if not logger.handlers:
+                handler = RotatingFileHandler(
+                    self.log_path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8",
+                    delay=True
+                )
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+                logger.propagate = False
+            self._logger = logger
+        return self._logger
+
+    def summary(self):
+        with self._lock:
+            return {label: histogram.summary() for label, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
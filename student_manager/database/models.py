@@ -1,51 +1,161 @@
-class Student:
-    def __init__(self, idno, first_name, last_name, age, gender, year_level, college, course):
-        self.idno = idno
+from collections import namedtuple
+from functools import lru_cache
+
+
+class Record:
+    """Base for the models: attributes live in __slots__ (no per-row __dict__),
+    and row['column'] works too, so a model can stand in for a dictionary row.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __setitem__(self, field, value):
+        setattr(self, field, value)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(self[f] == other[f] for f in self.__slots__)
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field, None)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    @classmethod
+    def row_maker(cls, columns):
+        """Return a function building instances from result tuples in this column order.
+
+        Columns the model has no slot for are dropped; missing ones are None.
+        """
+        positions = [columns.index(field) if field in columns else None for field in cls.__slots__]
+        while positions and positions[-1] is None:
+            positions.pop()
+        if positions == list(range(len(positions))):
+            # Columns line up with the leading slots; the rest keep their defaults
+            count = len(positions)
+            return lambda values: cls(*values[:count])
+        return lambda values: cls(*[None if i is None else values[i] for i in positions])
+
+
+class Student(Record):
+    __slots__ = ("student_id", "first_name", "last_name", "age", "gender", "year_level",
+                 "college_code", "course_code", "enrollment_year", "college_name", "course_name", "_key")
+
+    def __init__(self, student_id, first_name, last_name, age, gender, year_level,
+                 college_code=None, course_code=None, enrollment_year=None,
+                 college_name=None, course_name=None, _key=None):
+        self.student_id = student_id
         self.first_name = first_name
         self.last_name = last_name
         self.age = age
         self.gender = gender
         self.year_level = year_level
-        self.college = college
-        self.course = course
+        self.college_code = college_code
+        self.course_code = course_code
+        self.enrollment_year = enrollment_year
+        self.college_name = college_name
+        self.course_name = course_name
+        self._key = _key
 
     def to_tuple(self):
+        """The stored columns, in add_student/update_student order"""
         return (
-            self.idno,
+            self.student_id,
             self.first_name,
             self.last_name,
             self.age,
             self.gender,
             self.year_level,
-            self.college,
-            self.course
+            self.college_code,
+            self.course_code
         )
 
     @classmethod
     def from_tuple(cls, student_tuple):
         return cls(*student_tuple)
 
-class College:
-    def __init__(self, code, name):
-        self.code = code
-        self.name = name
+
+class College(Record):
+    __slots__ = ("college_code", "college_name")
+
+    def __init__(self, college_code, college_name):
+        self.college_code = college_code
+        self.college_name = college_name
 
     def to_tuple(self):
-        return (self.code, self.name)
+        return (self.college_code, self.college_name)
 
     @classmethod
     def from_tuple(cls, college_tuple):
         return cls(*college_tuple)
 
-class Course:
-    def __init__(self, code, name, college_code):
-        self.code = code
-        self.name = name
+
+class Course(Record):
+    __slots__ = ("course_code", "course_name", "college_code")
+
+    def __init__(self, course_code, course_name, college_code=None):
+        self.course_code = course_code
+        self.course_name = course_name
         self.college_code = college_code
 
     def to_tuple(self):
-        return (self.code, self.name, self.college_code)
+        return (self.course_code, self.course_name, self.college_code)
 
     @classmethod
     def from_tuple(cls, course_tuple):
-        return cls(*course_tuple)
\ No newline at end of file
+        return cls(*course_tuple)
+
+
+@lru_cache(maxsize=64)
+def _namedtuple(columns):
+    return namedtuple("Row", columns, rename=True)
+
+
+def row_builder(columns, row_factory=None):
+    """Return a function converting one result tuple for the given row_factory.
+
+    row_factory is None (dicts), tuple, "namedtuple", or a class with
+    row_maker(columns) such as the models above.
+    """
+    columns = tuple(columns)
+    if row_factory is None or row_factory is dict:
+        return lambda values: dict(zip(columns, values))
+    if row_factory is tuple:
+        return tuple
+    if row_factory == "namedtuple":
+        return _namedtuple(columns)._make
+    return row_factory.row_maker(columns)
+
+
+class KeyedRows:
+    """row_factory adapter for keyset queries: the trailing key_count columns become row['_key']"""
+
+    def __init__(self, row_factory, key_count):
+        self.row_factory = row_factory
+        self.key_count = key_count
+
+    def row_maker(self, columns):
+        count = self.key_count
+        build = row_builder(columns[:-count], self.row_factory)
+
+        def make(values):
+            row = build(values[:-count])
+            row['_key'] = tuple(values[-count:])
+            return row
+        return make
+
+
+def build_rows(columns, rows, row_factory=None):
+    if row_factory is tuple:
+        return rows
+    build = row_builder(columns, row_factory)
+    return [build(values) for values in rows]
@@ -1,245 +1,250 @@
+import threading
+import time
+from collections import deque, OrderedDict
+from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import Error
-from config import DB_CONFIG
+from mysql.connector.errors import PoolError
+from config import DB_CONFIG, POOL_CONFIG
+from database.base import Database
+from database.setup import apply_migrations, setup_database
 
-class MySQLDatabase:
-    def __init__(self):
-        self.connection = None
-        self.connect()
-        
-    def connect(self):
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            print("MySQL Database connection successful")
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            
-    def execute_query(self, query, params=None, fetch=False):
-        cursor = None
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections shared by every window."""
+
+    def __init__(self, config=None, min_size=1, max_size=5, idle_timeout=300,
+                 health_check_interval=30, checkout_timeout=10, statement_cache_size=64):
+        self.config = dict(config or DB_CONFIG)
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self.statement_cache_size = statement_cache_size
+        self._statements = {}
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(self.min_size):
+            conn = self._create_connection()
+            self._idle.append((conn, time.monotonic()))
+            self._size += 1
+
+        self._reaper_stop = threading.Event()
+        self._reaper = None
+        if self.idle_timeout:
+            self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _create_connection(self):
+        return mysql.connector.connect(**self.config)
+
+    def _is_healthy(self, conn, last_used):
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            
-            if fetch:
-                return cursor.fetchall()
-            
-            self.connection.commit()
+            conn.ping(reconnect=False)
             return True
-            
-        except Error as e:
-            print(f"Error executing query: {e}")
+        except Error:
             return False
-        finally:
-            if cursor:
+
+    def _discard(self, conn):
+        self._size -= 1
+        self._statements.pop(id(conn), None)
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+
+                while self._idle:
+                    conn, last_used = self._idle.pop()
+                    if self._is_healthy(conn, last_used):
+                        return conn
+                    self._discard(conn)
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(f"No connection available after {self.checkout_timeout}s "
+                                    f"(pool size {self.max_size})")
+                self._cond.wait(remaining)
+
+        try:
+            return self._create_connection()
+        except Error:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Error:
+            with self._cond:
+                self._discard(conn)
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def prepared_cursor(self, conn, query):
+        """Return this connection's server-side prepared cursor for query, creating it on first use"""
+        statements = self._statements.setdefault(id(conn), OrderedDict())
+        cursor = statements.get(query)
+        if cursor is not None:
+            statements.move_to_end(query)
+            return cursor
+        
+        cursor = conn.cursor(prepared=True)
+        statements[query] = cursor
+        if len(statements) > self.statement_cache_size:
+            _, oldest = statements.popitem(last=False)
+            oldest.close()
+        return cursor
+    
+    def forget_statement(self, conn, query):
+        cursor = self._statements.get(id(conn), {}).pop(query, None)
+        if cursor is not None:
+            try:
                 cursor.close()
-                
-    def get_colleges(self):
-        query = "SELECT * FROM colleges ORDER BY college_name"
-        return self.execute_query(query, fetch=True)
-        
-    def get_courses_by_college(self, college_code):
-        query = """
-        SELECT course_code, course_name 
-        FROM courses 
-        WHERE college_code = %s
-        ORDER BY course_name
-        """
-        return self.execute_query(query, (college_code,), fetch=True)
-        
-    def get_all_courses(self):
-        query = """
-        SELECT c.course_code, c.course_name, co.college_name 
-        FROM courses c
-        JOIN colleges co ON c.college_code = co.college_code
-        ORDER BY co.college_name, c.course_name
-        """
-        return self.execute_query(query, fetch=True)
-        
-    def get_students(self, filters=None):
-        query = """
-        SELECT s.*, co.college_name, c.course_name
-        FROM students s
-        LEFT JOIN colleges co ON s.college_code = co.college_code
-        LEFT JOIN courses c ON s.course_code = c.course_code
-        """
-        
-        params = []
-        where_clauses = []
-        
-        if filters:
-            if filters.get('college'):
-                where_clauses.append("s.college_code = %s")
-                params.append(filters['college'])
-            if filters.get('year_level'):
-                where_clauses.append("s.year_level = %s")
-                params.append(filters['year_level'])
-            if filters.get('gender'):
-                where_clauses.append("s.gender = %s")
-                params.append(filters['gender'])
-            
-            if filters.get('search_id'):
-                where_clauses.append("s.student_id LIKE %s")
-                params.append(f"%{filters['search_id']}%")
-            elif filters.get('search_first_name'):
-                where_clauses.append("s.first_name LIKE %s")
-                params.append(f"%{filters['search_first_name']}%")
-            elif filters.get('search_last_name'):
-                where_clauses.append("s.last_name LIKE %s")
-                params.append(f"%{filters['search_last_name']}%")
-        
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-            
-        if filters and filters.get('sort_by'):
-            sort_order = "DESC" if filters.get('sort_order') == "Descending" else "ASC"
-            query += f" ORDER BY {filters['sort_by']} {sort_order}"
-        else:
-            query += " ORDER BY s.last_name, s.first_name"
-            
-        return self.execute_query(query, params, fetch=True)
-        
-    def add_student(self, student_data):
-        query = """
-        INSERT INTO students 
-        (student_id, first_name, last_name, age, gender, year_level, college_code, course_code)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        return self.execute_query(query, student_data)
-        
-    def update_student(self, old_student_id, student_data):
-        query = """
-        UPDATE students 
-        SET student_id = %s, first_name = %s, last_name = %s, age = %s, gender = %s, 
-            year_level = %s, college_code = %s, course_code = %s
-        WHERE student_id = %s
-        """
-
-        params = (*student_data, old_student_id)
-        return self.execute_query(query, params)
-        
-    def delete_student(self, student_id):
-        query = "DELETE FROM students WHERE student_id = %s"
-        return self.execute_query(query, (student_id,))
-        
-    def add_college(self, college_code, college_name):
-        query = "INSERT INTO colleges (college_code, college_name) VALUES (%s, %s)"
-        return self.execute_query(query, (college_code, college_name))
-        
-    def update_college(self, old_code, college_code, college_name):
+            except Error:
+                pass
+    
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-            
-            cursor.execute("""
-                UPDATE students 
-                SET college_code = %s 
-                WHERE college_code = %s
-            """, (college_code, old_code))
-            
-            cursor.execute("""
-                UPDATE courses 
-                SET college_code = %s 
-                WHERE college_code = %s
-            """, (college_code, old_code))
-            
-            cursor.execute("""
-                UPDATE colleges 
-                SET college_code = %s, college_name = %s 
-                WHERE college_code = %s
-            """, (college_code, college_name, old_code))
-            
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-            
-            self.connection.commit()
-            return True
-            
-        except Error as e:
-            print(f"Error updating college: {e}")
-            self.connection.rollback()
-            return False
+            yield conn
         finally:
-            if cursor:
-                cursor.close()
+            self.release(conn)
 
+    def reap_idle(self):
+        """Close connections idle longer than idle_timeout, keeping min_size open"""
+        now = time.monotonic()
+        with self._cond:
+            keep = deque()
+            while self._idle:
+                conn, last_used = self._idle.popleft()
+                if self._size > self.min_size and now - last_used > self.idle_timeout:
+                    self._discard(conn)
+                else:
+                    keep.append((conn, last_used))
+            self._idle = keep
+
+    def _reap_loop(self):
+        interval = max(1, min(self.idle_timeout, 60))
+        while not self._reaper_stop.wait(interval):
+            self.reap_idle()
+
+    def close(self):
+        self._reaper_stop.set()
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+class MySQLDatabase(Database):
+    Error = Error
+    dialect = "mysql"
         
-    def delete_college(self, college_code):
+    def connect(self):
         try:
-            update_students_query = """
-            UPDATE students 
-            SET college_code = NULL 
-            WHERE college_code = %s
-            """
-            self.execute_query(update_students_query, (college_code,))
-            
-            update_courses_query = """
-            UPDATE courses 
-            SET college_code = NULL 
-            WHERE college_code = %s
-            """
-            self.execute_query(update_courses_query, (college_code,))
-            
-            delete_query = "DELETE FROM colleges WHERE college_code = %s"
-            return self.execute_query(delete_query, (college_code,))
-        except Exception as e:
-            print(f"Error deleting college: {e}")
-            return False
-        
-    def add_course(self, course_code, course_name, college_code):
-        query = """
-        INSERT INTO courses (course_code, course_name, college_code)
-        VALUES (%s, %s, %s)
-        """
-        return self.execute_query(query, (course_code, course_name, college_code))
-        
-    def update_course(self, old_code, course_code, course_name, college_code):
+            self.pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+            print("MySQL Database connection successful")
+        except Error as e:
+            print(f"Error connecting to MySQL: {e}")
+    
+    def migrate(self):
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-            
-            cursor.execute("""
-                UPDATE students 
-                SET course_code = %s 
-                WHERE course_code = %s
-            """, (course_code, old_code))
-            
-            cursor.execute("""
-                UPDATE courses 
-                SET course_code = %s, course_name = %s, college_code = %s
-                WHERE course_code = %s
-            """, (course_code, course_name, college_code, old_code))
-            
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-            
-            self.connection.commit()
-            return True
-            
+            with self._connection() as connection:
+                return apply_migrations(connection)
         except Error as e:
-            print(f"Error updating course: {e}")
-            self.connection.rollback()
+            print(f"Error applying migrations: {e}")
+            return False
+    
+    def setup(self):
+        if not setup_database():
             return False
+        if self.pool is None:
+            self.connect()
+        return self.pool is not None
+    
+    def _cursor(self, connection, streaming=False):
+        if streaming:
+            return connection.cursor(buffered=False)
+        return connection.cursor()
+    
+    def _close_stream(self, connection, cursor):
+        if connection.unread_result:
+            connection.consume_results()
+        cursor.close()
+    
+    def _explain(self, connection, query, params):
+        if query.lstrip().split(None, 1)[0].upper() not in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+            return None
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("EXPLAIN " + query, params or ())
+            columns = cursor.column_names
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Error as e:
+            return [f"EXPLAIN failed: {e}"]
         finally:
             if cursor:
                 cursor.close()
-        
-    def delete_course(self, course_code):
-        update_query = """
-        UPDATE students 
-        SET course_code = NULL 
-        WHERE course_code = %s
-        """
-        self.execute_query(update_query, (course_code,))
-        
-        delete_query = "DELETE FROM courses WHERE course_code = %s"
-        return self.execute_query(delete_query, (course_code,))
     
-    def clear_all_students(self):
-        """Delete all student records from the database"""
-        query = "DELETE FROM students"
-        return self.execute_query(query)
-        
-    def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            
\ No newline at end of file
+    def _estimate_rows(self, clauses, params):
+        # InnoDB statistics are sampled: expect these to be tens of percent off
+        if not clauses:
+            rows = self.execute_query(
+                "SELECT TABLE_ROWS AS estimate FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'students'",
+                fetch=True, label="estimate_student_count"
+            )
+            if not rows or rows[0]['estimate'] is None:
+                return None
+            return int(rows[0]['estimate'])
+
+        rows = self.execute_query(
+            "EXPLAIN " + self._student_sql("count", clauses), params,
+            fetch=True, label="estimate_student_count"
+        )
+        for row in rows or ():
+            if row['table'] == 's' and row['rows'] is not None:
+                return int(row['rows'] * float(row['filtered'] or 100) / 100)
+        return None
+    
+    def _execute_prepared(self, connection, query, params):
+        # Prepared cursors stay open with their connection and are reused
+        # for every call with the same SQL text, skipping the re-parse.
+        cursor = self.pool.prepared_cursor(connection, query)
+        try:
+            cursor.execute(query, tuple(params or ()))
+            return cursor.column_names, cursor.fetchall()
+        except Error:
+            self.pool.forget_statement(connection, query)
+            raise
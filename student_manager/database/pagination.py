@@ -0,0 +1,127 @@
+import threading
+
+
+class StudentPager:
+    """Keyset pagination over get_students with a lazily built page-anchor index.
+
+    first/prev/next/last are answered by seeking from the keys of the page
+    currently shown; any other page starts from the nearest anchor (the key
+    preceding every anchor_stride-th page), so no query skips more than
+    anchor_stride pages worth of rows.
+    """
+
+    def __init__(self, db, page_size=20, anchor_stride=10, row_factory=None):
+        self.db = db
+        self.page_size = page_size
+        self.anchor_stride = anchor_stride
+        self.row_factory = row_factory
+        self.filters = {}
+        self._signature = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._version = self.db.write_version
+        self._anchors = {1: None}
+        self._page = None
+        self._first_key = None
+        self._last_key = None
+
+    def set_filters(self, filters):
+        signature = tuple(sorted((filters or {}).items()))
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self.filters = dict(filters or {})
+                self._reset()
+
+    def fetch(self, filters, page, total=None, exact=True):
+        """Return (rows, total, page) for the filters, with page clamped to range.
+
+        A total the caller already has is used instead of counting; if it is
+        only an estimate (exact=False) the last page is not read from the end.
+        """
+        with self._lock:
+            self.set_filters(filters)
+            if total is None:
+                total = self.count()
+            page = min(max(page, 1), self.total_pages(total))
+            return self._get_page(page, total, exact), total, page
+
+    def count(self):
+        return self.db.counts.exact(self.filters)
+
+    def total_pages(self, total=None):
+        if total is None:
+            total = self.count()
+        return max(1, (total + self.page_size - 1) // self.page_size)
+
+    def get_page(self, page):
+        with self._lock:
+            return self._get_page(page)
+
+    def _get_page(self, page, total=None, exact=True):
+        if self._version != self.db.write_version:
+            self._reset()
+
+        if total is None:
+            total = self.count()
+        total_pages = self.total_pages(total)
+        page = min(max(page, 1), total_pages)
+
+        if page == 1:
+            rows = self.db.get_students_keyset(
+                self.filters, limit=self.page_size, row_factory=self.row_factory
+            )
+        elif self._page is not None and page == self._page + 1:
+            rows = self.db.get_students_keyset(
+                self.filters, after=self._last_key, limit=self.page_size, row_factory=self.row_factory
+            )
+        elif self._page is not None and page == self._page - 1:
+            rows = self.db.get_students_keyset(
+                self.filters, after=self._first_key, limit=self.page_size, backward=True,
+                row_factory=self.row_factory
+            )
+        elif exact and page == total_pages:
+            remainder = total - (total_pages - 1) * self.page_size
+            rows = self.db.get_students_keyset(
+                self.filters, limit=remainder, backward=True, row_factory=self.row_factory
+            )
+        else:
+            rows = self._seek_from_anchor(page)
+
+        self._remember(page, rows)
+        return rows
+
+    def _seek_from_anchor(self, page):
+        anchor_page = ((page - 1) // self.anchor_stride) * self.anchor_stride + 1
+        if anchor_page not in self._anchors:
+            self._build_anchors()
+
+        offset = (page - anchor_page) * self.page_size
+        if anchor_page not in self._anchors:
+            return self.db.get_students_page(self.filters, page, self.page_size, self.row_factory) or []
+        return self.db.get_students_keyset(
+            self.filters, after=self._anchors[anchor_page], limit=self.page_size, offset=offset,
+            row_factory=self.row_factory
+        )
+
+    def _build_anchors(self):
+        rows_per_anchor = self.page_size * self.anchor_stride
+        try:
+            for index, key in enumerate(self.db.iter_student_keys(self.filters), start=1):
+                if index % rows_per_anchor == 0:
+                    self._anchors[index // self.page_size + 1] = key
+        except self.db.Error as e:
+            print(f"Error building page anchors: {e}")
+
+    def _remember(self, page, rows):
+        if not rows:
+            self._page = None
+            return
+
+        self._page = page
+        self._first_key = rows[0]['_key']
+        self._last_key = rows[-1]['_key']
+        if len(rows) == self.page_size and page % self.anchor_stride == 0:
+            self._anchors[page + 1] = self._last_key
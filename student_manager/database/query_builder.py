@@ -0,0 +1,287 @@
+from functools import lru_cache
+from utils.formats import GENDERS, YEAR_LEVELS
+
+STUDENT_SORT_KEYS = {
+    'student_id': (),
+    'first_name': ("s.first_name",),
+    'last_name': ("s.last_name",),
+    'age': ("s.age",),
+    'gender': ("s.gender",),
+    'year_level': ("s.year_level",),
+    'college_code': ("s.college_code",),
+    'course_code': ("s.course_code",)
+}
+# Both backends sort NULL before any value ascending; seeks on these spell that out
+NULLABLE_SORT_KEYS = ("s.college_code", "s.course_code")
+DEFAULT_SORT_KEYS = ("s.last_name", "s.first_name")
+SEARCH_COLUMNS = {
+    'search_id': "s.student_id",
+    'search_first_name': "s.first_name",
+    'search_last_name': "s.last_name"
+}
+# MySQL ENUMs sort by declaration order; SQLite stores them as text
+ENUM_SORT_KEYS = {"s.gender": GENDERS, "s.year_level": YEAR_LEVELS}
+# Manager tables: every ordering ends on the primary key so pages are stable
+COLLEGE_SORT_KEYS = {
+    'college_code': ("c.college_code",),
+    'college_name': ("c.college_name", "c.college_code"),
+    'course_count': ("course_count", "c.college_code")
+}
+COURSE_SORT_KEYS = {
+    'course_code': ("c.course_code",),
+    'course_name': ("c.course_name", "c.course_code"),
+    'college_name': ("COALESCE(co.college_name, '')", "c.course_code")
+}
+COURSE_SEARCH_COLUMNS = {
+    'course_code': "c.course_code",
+    'course_code_prefix': "c.course_code",
+    'course_name': "c.course_name"
+}
+# Searches matching from the start, which the column's index can serve; the rest match anywhere and scan
+PREFIX_SEARCH_COLUMNS = ("course_code_prefix",)
+# Candidate lists are padded to this size times a power of two, so IN (...) has few shapes
+IN_LIST_BUCKET = 8
+
+STUDENT_SELECT = """
+        SELECT s.*, co.college_name, c.course_name{columns}
+        FROM students s
+        LEFT JOIN colleges co ON s.college_code = co.college_code
+        LEFT JOIN courses c ON s.course_code = c.course_code
+        """
+
+
+def search_clause(column, text, mode=None):
+    # Prefix and exact matches can use the column's index, contains cannot.
+    # Fuzzy matching needs the trigram index; without it, fall back to contains.
+    # '!' is the LIKE escape because MySQL and SQLite disagree on backslashes.
+    if mode == "exact":
+        return f"{column} = %s", text
+    if mode in ("contains", "fuzzy"):
+        return f"{column} LIKE %s ESCAPE '!'", contains_pattern(text)
+    return f"{column} LIKE %s ESCAPE '!'", prefix_pattern(text)
+
+
+def _escape_like(text):
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def prefix_pattern(text):
+    """LIKE ... ESCAPE '!' pattern matching values starting with text"""
+    return f"{_escape_like(text)}%"
+
+
+def contains_pattern(text):
+    """LIKE ... ESCAPE '!' pattern matching text anywhere"""
+    return f"%{_escape_like(text)}%"
+
+
+def _in_list_size(count):
+    size = IN_LIST_BUCKET
+    while size < count:
+        size *= 2
+    return size
+
+
+def student_filter(filters, candidates=None):
+    """Reduce filters to (clauses, params).
+
+    The clauses tuple only depends on which filters are set, never on their
+    values, so it can key a statement cache. candidates(column, text, mode)
+    may return matching student IDs (or None to fall back to LIKE).
+    """
+    clauses = []
+    params = []
+    if not filters:
+        return (), params
+
+    if filters.get('college'):
+        clauses.append("s.college_code = %s")
+        params.append(filters['college'])
+    if filters.get('year_level'):
+        clauses.append("s.year_level = %s")
+        params.append(filters['year_level'])
+    if filters.get('gender'):
+        clauses.append("s.gender = %s")
+        params.append(filters['gender'])
+    if filters.get('enrollment_year'):
+        clauses.append("s.enrollment_year = %s")
+        params.append(int(filters['enrollment_year']))
+
+    for field, column in SEARCH_COLUMNS.items():
+        if filters.get(field):
+            ids = candidates(column, filters[field], filters.get('search_mode')) if candidates else None
+            if ids is None:
+                clause, value = search_clause(column, filters[field], filters.get('search_mode'))
+                clauses.append(clause)
+                params.append(value)
+            elif ids:
+                ids = sorted(ids)
+                size = _in_list_size(len(ids))
+                clauses.append(f"s.student_id IN ({', '.join(['%s'] * size)})")
+                params.extend(ids + [ids[-1]] * (size - len(ids)))
+            else:
+                clauses.append("1 = 0")
+            break
+
+    return tuple(clauses), params
+
+
+def student_sort(filters):
+    """Return (keys, direction) from the whitelisted sort columns"""
+    if filters and filters.get('sort_by') in STUDENT_SORT_KEYS:
+        keys = STUDENT_SORT_KEYS[filters['sort_by']] + ("s.student_id",)
+        direction = "DESC" if filters.get('sort_order') == "Descending" else "ASC"
+        return keys, direction
+    return DEFAULT_SORT_KEYS + ("s.student_id",), "ASC"
+
+
+def student_row_sort(filters):
+    """In-memory counterpart of student_sort: (key function over a row, reverse)"""
+    sort_by = filters.get('sort_by') if filters else None
+    if sort_by in STUDENT_SORT_KEYS:
+        columns = ((sort_by,) if sort_by != 'student_id' else ()) + ('student_id',)
+        reverse = filters.get('sort_order') == "Descending"
+    else:
+        columns = ('last_name', 'first_name', 'student_id')
+        reverse = False
+    getters = [_row_sort_value(column) for column in columns]
+    return (lambda row: tuple(get(row) for get in getters)), reverse
+
+
+def _row_sort_value(column):
+    enum = ENUM_SORT_KEYS.get("s." + column)
+    if enum is not None:
+        return lambda row: enum.index(row[column]) if row[column] in enum else len(enum)
+    if column == 'age':
+        return lambda row: row[column]
+    # Case-insensitive with NULL first, like the collation and NULL ordering in SQL
+    return lambda row: (row[column] or "").lower()
+
+
+def _enum_position(key):
+    whens = " ".join(f"WHEN '{value}' THEN {i}" for i, value in enumerate(ENUM_SORT_KEYS[key], start=1))
+    return f"CASE {key} {whens} END"
+
+
+def _key_columns(keys, alias=False):
+    columns = []
+    for i, key in enumerate(keys):
+        column = f"{key} + 0" if key in ENUM_SORT_KEYS else key
+        columns.append(f"{column} AS _k{i}" if alias else column)
+    return ", ".join(columns)
+
+
+@lru_cache(maxsize=256)
+def seek_clause(keys, nulls, ascending):
+    """Return (condition, positions) selecting the rows past an anchor in key order.
+
+    nulls flags which anchor values are NULL; positions maps each placeholder
+    to its anchor value. Without nullable keys this is a plain row comparison.
+    """
+    if not any(key in NULLABLE_SORT_KEYS for key in keys):
+        placeholders = ", ".join(["%s"] * len(keys))
+        return f"({', '.join(keys)}) {'>' if ascending else '<'} ({placeholders})", tuple(range(len(keys)))
+
+    # (k0 past p0) OR (k0 = p0 AND k1 past p1) OR ..., with NULL as the smallest value
+    terms = []
+    positions = []
+    for i, key in enumerate(keys):
+        if nulls[i] and not ascending:
+            continue
+        conditions = []
+        for j in range(i):
+            if nulls[j]:
+                conditions.append(f"{keys[j]} IS NULL")
+            else:
+                conditions.append(f"{keys[j]} = %s")
+                positions.append(j)
+        if nulls[i]:
+            conditions.append(f"{key} IS NOT NULL")
+        elif ascending or key not in NULLABLE_SORT_KEYS:
+            conditions.append(f"{key} {'>' if ascending else '<'} %s")
+            positions.append(i)
+        else:
+            conditions.append(f"({key} < %s OR {key} IS NULL)")
+            positions.append(i)
+        terms.append("(" + " AND ".join(conditions) + ")")
+    return "(" + " OR ".join(terms or ["1 = 0"]) + ")", tuple(positions)
+
+
+@lru_cache(maxsize=256)
+def student_sql(kind, clauses, keys=(), direction="ASC", seek=None, backward=False, dialect="mysql"):
+    """Build the SQL text for one query shape.
+
+    kind is "rows", "page" (LIMIT/OFFSET), "keyset" (rows plus _k sort key
+    columns, LIMIT/OFFSET), "keys" (sort keys only) or "count". seek, when
+    given, flags which anchor values are NULL (see seek_clause). Results are
+    cached, so the same shape always yields the identical string.
+    """
+    if dialect == "sqlite":
+        keys = tuple(_enum_position(key) if key in ENUM_SORT_KEYS else key for key in keys)
+    where = list(clauses)
+    if seek is not None:
+        where.append(seek_clause(keys, seek, (direction == "ASC") != backward)[0])
+    where_sql = " WHERE " + " AND ".join(where) if where else ""
+
+    if kind == "count":
+        return f"SELECT COUNT(*) AS total FROM students s{where_sql}"
+
+    if backward:
+        direction = "ASC" if direction == "DESC" else "DESC"
+    order_by = " ORDER BY " + ", ".join(f"{key} {direction}" for key in keys)
+
+    if kind == "keys":
+        return f"SELECT {_key_columns(keys)} FROM students s{where_sql}{order_by}"
+
+    columns = ", " + _key_columns(keys, alias=True) if kind == "keyset" else ""
+    query = STUDENT_SELECT.format(columns=columns) + where_sql + order_by
+    if kind in ("page", "keyset"):
+        query += " LIMIT %s OFFSET %s"
+    return query
+
+
+def _order_by(keys, direction):
+    return " ORDER BY " + ", ".join(f"{key} {direction}" for key in keys)
+
+
+@lru_cache(maxsize=64)
+def college_sql(kind, searching=False, sort_by="college_code", direction="ASC"):
+    """SQL for the college manager; kind is "page" (LIMIT/OFFSET) or "count".
+
+    When searching, code or name must contain the text: two contains_pattern
+    parameters come first. That scans colleges, which is fine at catalog sizes.
+    """
+    where = " WHERE (c.college_code LIKE %s ESCAPE '!' OR c.college_name LIKE %s ESCAPE '!')" if searching else ""
+    if kind == "count":
+        return f"SELECT COUNT(*) AS total FROM colleges c{where}"
+    keys = COLLEGE_SORT_KEYS.get(sort_by, COLLEGE_SORT_KEYS['college_code'])
+    # Counted per returned college through idx_courses_college_name, not grouped over all of them
+    return (
+        "SELECT c.college_code, c.college_name, "
+        "(SELECT COUNT(*) FROM courses co WHERE co.college_code = c.college_code) AS course_count "
+        f"FROM colleges c{where}{_order_by(keys, direction)} LIMIT %s OFFSET %s"
+    )
+
+
+@lru_cache(maxsize=64)
+def course_sql(kind, by_college=False, search_column=None, sort_by="course_code", direction="ASC"):
+    """SQL for the course manager; kind is "page" (LIMIT/OFFSET) or "count".
+
+    Parameters, in order: the college code if by_college, then, if
+    search_column is one of COURSE_SEARCH_COLUMNS, a prefix_pattern for
+    PREFIX_SEARCH_COLUMNS or a contains_pattern otherwise.
+    """
+    where = []
+    if by_college:
+        where.append("c.college_code = %s")
+    if search_column in COURSE_SEARCH_COLUMNS:
+        where.append(f"{COURSE_SEARCH_COLUMNS[search_column]} LIKE %s ESCAPE '!'")
+    where_sql = " WHERE " + " AND ".join(where) if where else ""
+    if kind == "count":
+        return f"SELECT COUNT(*) AS total FROM courses c{where_sql}"
+    keys = COURSE_SORT_KEYS.get(sort_by, COURSE_SORT_KEYS['course_code'])
+    return (
+        "SELECT c.course_code, c.course_name, c.college_code, co.college_name "
+        "FROM courses c LEFT JOIN colleges co ON c.college_code = co.college_code"
+        f"{where_sql}{_order_by(keys, direction)} LIMIT %s OFFSET %s"
+    )
@@ -0,0 +1,71 @@
+import threading
+
+SEARCH_FIELDS = {
+    'search_id': 'student_id',
+    'search_first_name': 'first_name',
+    'search_last_name': 'last_name'
+}
+
+
+class SearchNarrower:
+    """Answers search-as-you-type from memory when the new text extends the last one.
+
+    When a search matches at most `limit` students the whole result is kept;
+    typing more characters can only shrink a prefix or contains match, so the
+    next search is a filter over those rows instead of another query.
+    """
+
+    def __init__(self, db, limit=2000, row_factory=None):
+        self.db = db
+        self.limit = limit
+        self.row_factory = row_factory
+        self._lock = threading.Lock()
+        self._candidates = None
+
+    def _split(self, filters):
+        for field in SEARCH_FIELDS:
+            if filters.get(field):
+                base = tuple(sorted((k, v) for k, v in filters.items() if k != field))
+                return base, field, filters[field].lower()
+        return None
+
+    def _narrow(self, base, field, text):
+        with self._lock:
+            candidates = self._candidates
+        if candidates is None:
+            return None
+
+        version, cached_base, cached_field, cached_text, rows = candidates
+        if (version != self.db.write_version or cached_base != base
+                or cached_field != field or not text.startswith(cached_text)):
+            return None
+
+        column = SEARCH_FIELDS[field]
+        mode = dict(base).get('search_mode')
+        if mode in ("exact", "fuzzy"):
+            return None
+        if mode == "contains":
+            return [row for row in rows if text in (row[column] or "").lower()]
+        return [row for row in rows if (row[column] or "").lower().startswith(text)]
+
+    def search(self, filters):
+        """Return every student matching filters, or None if the search is too broad to hold"""
+        split = self._split(filters)
+        if split is None:
+            return None
+
+        base, field, text = split
+        rows = self._narrow(base, field, text)
+        if rows is not None:
+            return rows
+
+        version = self.db.write_version
+        if self.db.counts.exact(filters) > self.limit:
+            return None
+        rows = self.db.get_students(filters, self.row_factory)
+        if rows is False:
+            return None
+
+        with self._lock:
+            self._candidates = (version, base, field, text, rows)
+        return rows
@@ -7,21 +7,163 @@ from config import DB_CONFIG
 import mysql.connector
 from mysql.connector import Error
 
-def setup_database():
+def _table_exists(cursor, table):
+    cursor.execute("""
+    SELECT 1 FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone() is not None
+
+def _index_exists(cursor, table, index_name):
+    cursor.execute("""
+    SELECT 1 FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+    SELECT 1 FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+def _foreign_keys(cursor, table, referenced_table):
+    cursor.execute("""
+    SELECT CONSTRAINT_NAME, UPDATE_RULE, DELETE_RULE FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME = %s
+    """, (table, referenced_table))
+    return cursor.fetchall()
+
+def _add_index(cursor, table, index_name, columns):
+    if _index_exists(cursor, table, index_name):
+        return
+    cursor.execute(
+        f"ALTER TABLE {table} ADD INDEX {index_name} ({columns}), ALGORITHM=INPLACE, LOCK=NONE"
+    )
+    print(f"Index {index_name} created on {table}")
+
+def _migration_secondary_indexes(cursor):
+    _add_index(cursor, "students", "idx_students_name", "last_name, first_name")
+    _add_index(cursor, "students", "idx_students_first_name", "first_name")
+    _add_index(cursor, "students", "idx_students_age", "age")
+    _add_index(cursor, "students", "idx_students_college_name", "college_code, last_name, first_name")
+    _add_index(cursor, "students", "idx_students_year_name", "year_level, last_name, first_name")
+    _add_index(cursor, "students", "idx_students_gender_name", "gender, last_name, first_name")
+    _add_index(cursor, "colleges", "idx_colleges_name", "college_name")
+    _add_index(cursor, "courses", "idx_courses_name", "course_name")
+    _add_index(cursor, "courses", "idx_courses_college_name", "college_code, course_name")
+
+def _migration_enrollment_year(cursor):
+    # A STORED generated column needs a table rebuild, so this one cannot run with LOCK=NONE
+    if not _column_exists(cursor, "students", "enrollment_year"):
+        cursor.execute("""
+        ALTER TABLE students
+        ADD COLUMN enrollment_year SMALLINT UNSIGNED
+            AS (CAST(LEFT(student_id, 4) AS UNSIGNED)) STORED
+        """)
+        print("Column enrollment_year added to students")
+    _add_index(cursor, "students", "idx_students_enrollment_year", "enrollment_year, last_name, first_name")
+
+def _cascade_foreign_key(cursor, table, column, parent, name):
+    keys = _foreign_keys(cursor, table, parent)
+    if [tuple(key) for key in keys] == [(name, "CASCADE", "SET NULL")]:
+        return
+    # Earlier renames ran with FOREIGN_KEY_CHECKS = 0, so clear any dangling
+    # references before the constraint is recreated without validation.
+    # This rewrites data, so say exactly what is cleared.
+    cursor.execute(f"""
+    SELECT t.{column}, COUNT(*) FROM {table} t LEFT JOIN {parent} p ON t.{column} = p.{column}
+    WHERE t.{column} IS NOT NULL AND p.{column} IS NULL
+    GROUP BY t.{column}
+    """)
+    dangling = cursor.fetchall()
+    if dangling:
+        cursor.execute(f"""
+        UPDATE {table} t LEFT JOIN {parent} p ON t.{column} = p.{column}
+        SET t.{column} = NULL
+        WHERE t.{column} IS NOT NULL AND p.{column} IS NULL
+        """)
+        codes = ", ".join(f"{code} ({count})" for code, count in dangling)
+        print(f"Set {table}.{column} to NULL in {cursor.rowcount} rows referencing missing {parent}: {codes}")
+    for key_name, _, _ in keys:
+        cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {key_name}")
+    cursor.execute(f"""
+    ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {parent}({column})
+        ON UPDATE CASCADE ON DELETE SET NULL
+    """)
+    print(f"Foreign key {name} now cascades updates and nulls deletes")
+
+def _migration_cascading_foreign_keys(cursor):
+    # With checks off the constraints are added in place instead of copying the table
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    try:
+        _cascade_foreign_key(cursor, "courses", "college_code", "colleges", "fk_courses_college")
+        _cascade_foreign_key(cursor, "students", "college_code", "colleges", "fk_students_college")
+        _cascade_foreign_key(cursor, "students", "course_code", "courses", "fk_students_course")
+    finally:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+# Ordered (version, description, step) entries. Steps must be safe to re-run,
+# since MySQL commits DDL implicitly and a step can be interrupted half way.
+MIGRATIONS = [
+    (1, "Secondary indexes for student filters/sorts and duplicate-name checks", _migration_secondary_indexes),
+    (2, "Indexed enrollment_year generated from the student ID prefix", _migration_enrollment_year),
+    (3, "Foreign keys cascade code renames and null out deleted colleges/courses", _migration_cascading_foreign_keys),
+]
+
+def apply_migrations(connection):
+    """Bring an existing database up to the latest schema version"""
+    cursor = connection.cursor()
+    try:
+        if not _table_exists(cursor, "schema_version"):
+            cursor.execute("""
+            CREATE TABLE schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+        
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        current_version = cursor.fetchone()[0]
+        
+        for version, description, step in MIGRATIONS:
+            if version <= current_version:
+                continue
+            print(f"Applying migration {version}: {description}")
+            step(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            connection.commit()
+    except Error as e:
+        print(f"Error applying migrations: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+    
+    return True
+
+def setup_database(config=None):
+    config = config or DB_CONFIG
     try:
         connection = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
+            host=config['host'],
+            user=config['user'],
+            password=config['password']
         )
         
         if connection.is_connected():
             cursor = connection.cursor()
             
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-            print(f"Database {DB_CONFIG['database']} created successfully")
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {config['database']}")
+            print(f"Database {config['database']} created successfully")
             
-            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(f"USE {config['database']}")
             
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS colleges (
@@ -36,7 +178,8 @@ def setup_database():
                 course_code VARCHAR(20) PRIMARY KEY,
                 course_name VARCHAR(100) NOT NULL,
                 college_code VARCHAR(10),
-                FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+                CONSTRAINT fk_courses_college FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+                    ON UPDATE CASCADE ON DELETE SET NULL
             )
             """)
             print("Courses table created successfully")
@@ -51,17 +194,24 @@ def setup_database():
                 year_level ENUM('1st', '2nd', '3rd', '4th', '5+') NOT NULL,
                 college_code VARCHAR(10),
                 course_code VARCHAR(20),
-                FOREIGN KEY (college_code) REFERENCES colleges(college_code) ON DELETE SET NULL,
-                FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL
+                CONSTRAINT fk_students_college FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+                    ON UPDATE CASCADE ON DELETE SET NULL,
+                CONSTRAINT fk_students_course FOREIGN KEY (course_code) REFERENCES courses(course_code)
+                    ON UPDATE CASCADE ON DELETE SET NULL
             )
             """)
             print("Students table created successfully")
             
             connection.commit()
             
+            migrated = apply_migrations(connection)
+            
             cursor.close()
             connection.close()
             
+            if not migrated:
+                return False
+            
             print("Database setup completed successfully!")
             
     except Error as e:
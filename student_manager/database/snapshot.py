@@ -0,0 +1,490 @@
+import threading
+from itertools import islice
+from utils.formats import GENDERS, YEAR_LEVELS
+from database.models import row_builder
+from database.query_builder import STUDENT_SORT_KEYS
+from database.search_cache import SEARCH_FIELDS
+from database.trigram import fuzzy_searchable, within_distance
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Same columns, in the same order, as a get_students row
+COLUMNS = ("student_id", "first_name", "last_name", "age", "gender", "year_level",
+           "college_code", "course_code", "enrollment_year", "college_name", "course_name")
+STORED_COLUMNS = COLUMNS[:8]
+ENCODED_COLUMNS = ("first_name", "last_name", "gender", "year_level", "college_code", "course_code")
+FILTER_COLUMNS = {'college': "college_code", 'year_level': "year_level", 'gender': "gender"}
+DEFAULT_SORT = ("last_name", "first_name")
+# Rows encoded per step of build(), so the raw rows are never all in memory at once
+BUILD_BATCH_SIZE = 50000
+
+
+def _text_key(value):
+    # Case-insensitive, NULL first: matches the collation and NULL ordering in SQL
+    return (value or "").lower()
+
+
+def _enum_key(values):
+    return lambda value: values.index(value) if value in values else len(values)
+
+
+class _Dictionary:
+    """Append-only value <-> int code mapping, with codes ranked in sort order on demand"""
+
+    def __init__(self, sort_key, values=()):
+        self.sort_key = sort_key
+        self.values = []
+        self.codes = {}
+        self._ranks = None
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self._ranks = None
+        return code
+
+    def encode(self, values):
+        code = self.code
+        return np.fromiter((code(value) for value in values), dtype=np.int32, count=len(values))
+
+    def rename(self, old, new):
+        """Relabel old as new; returns (old code, existing code for new or None)"""
+        code = self.codes.pop(old, None)
+        if code is None:
+            return None, None
+        existing = self.codes.get(new)
+        if existing is not None:
+            return code, existing
+        self.codes[new] = code
+        self.values[code] = new
+        self._ranks = None
+        return code, None
+
+    def ranks(self):
+        """Sort position of every code; equal sort keys share a rank"""
+        if self._ranks is None:
+            keys = [self.sort_key(value) for value in self.values]
+            ranks = np.empty(len(keys), dtype=np.int32)
+            rank = -1
+            previous = object()
+            for code in sorted(range(len(keys)), key=keys.__getitem__):
+                if keys[code] != previous:
+                    rank += 1
+                    previous = keys[code]
+                ranks[code] = rank
+            self._ranks = ranks
+        return self._ranks
+
+    def matches(self, predicate):
+        """Boolean lookup table: which codes' values satisfy predicate"""
+        return np.fromiter((predicate(value) for value in self.values), dtype=bool, count=len(self.values))
+
+
+class StudentSnapshot:
+    """Columnar in-memory copy of the students table.
+
+    Names, gender, year level, college and course are dictionary-encoded
+    into int32 code arrays; ID, age and enrollment year are plain arrays.
+    Filters become boolean masks (search predicates run once per distinct
+    value, not per row) and sorts a lexsort over per-code ranks, so it
+    answers get_students-style requests without a database round trip.
+
+    Database applies its own writes here as it makes them; writes by other
+    clients only show up after refresh().
+    """
+
+    def __init__(self, db):
+        if np is None:
+            raise RuntimeError("The student snapshot needs NumPy")
+        self.db = db
+        self._lock = threading.RLock()
+        self.ready = False
+        self._pending = []
+        self._replaying = False
+        self.college_names = {}
+        self.course_names = {}
+        self._reset()
+
+    def _reset(self):
+        self._dicts = {
+            'first_name': _Dictionary(_text_key),
+            'last_name': _Dictionary(_text_key),
+            'gender': _Dictionary(_enum_key(GENDERS), GENDERS),
+            'year_level': _Dictionary(_enum_key(YEAR_LEVELS), YEAR_LEVELS),
+            'college_code': _Dictionary(_text_key),
+            'course_code': _Dictionary(_text_key)
+        }
+        self._size = 0
+        self._dead = 0
+        self._ids = np.empty(0, dtype="U1")
+        self._ages = np.empty(0, dtype=np.int16)
+        self._years = np.empty(0, dtype=np.int16)
+        self._alive = np.empty(0, dtype=bool)
+        self._codes = {column: np.empty(0, dtype=np.int32) for column in ENCODED_COLUMNS}
+        self._version = 0
+        self._id_ranks = None
+        self._order_cache = None
+
+    def __len__(self):
+        return self._size - self._dead
+
+    def nbytes(self):
+        arrays = [self._ids, self._ages, self._years, self._alive] + list(self._codes.values())
+        return sum(array.nbytes for array in arrays)
+
+    # Loading
+
+    def build(self, rows=None):
+        """Load (student_id, first_name, ..., course_code) rows, by default streamed from the database.
+
+        Writes that arrive while loading are queued and replayed afterwards.
+        """
+        with self._lock:
+            self.ready = False
+            self._pending = []
+        if rows is None:
+            rows = self.db._iter_query(
+                f"SELECT {', '.join(STORED_COLUMNS)} FROM students", label="build_snapshot"
+            )
+        college_names = {c['college_code']: c['college_name'] for c in self.db.get_colleges() or []}
+        course_names = {c['course_code']: c['course_name'] for c in self.db.get_courses() or []}
+
+        with self._lock:
+            self._reset()
+            self.college_names = college_names
+            self.course_names = course_names
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, BUILD_BATCH_SIZE))
+            if not batch:
+                break
+            with self._lock:
+                self._append(list(zip(*batch)))
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self.ready = True
+            # A queued write may already be in what was just read
+            self._replaying = True
+            try:
+                for method, args in pending:
+                    method(*args)
+            finally:
+                self._replaying = False
+
+    def refresh(self):
+        self.build()
+
+    def _queued(self, method, *args):
+        # Caller holds the lock; True means the write was queued for after the build
+        if self.ready:
+            return False
+        self._pending.append((method, args))
+        return True
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+
+        def grow(array):
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._ids = grow(self._ids)
+        self._ages = grow(self._ages)
+        self._years = grow(self._years)
+        self._alive = grow(self._alive)
+        self._codes = {column: grow(codes) for column, codes in self._codes.items()}
+
+    def _fit_ids(self, ids):
+        width = max((len(student_id) for student_id in ids), default=1)
+        if width > self._ids.dtype.itemsize // 4:
+            self._ids = self._ids.astype(f"U{width}")
+
+    def _append(self, columns):
+        ids = columns[0]
+        count = len(ids)
+        if not count:
+            return
+        self._reserve(count)
+        self._fit_ids(ids)
+        start, end = self._size, self._size + count
+        self._ids[start:end] = ids
+        self._ages[start:end] = columns[3]
+        self._years[start:end] = [int(i[:4]) if i[:4].isdigit() else 0 for i in ids]
+        self._alive[start:end] = True
+        for column, values in zip(STORED_COLUMNS, columns):
+            if column in self._codes:
+                self._codes[column][start:end] = self._dicts[column].encode(values)
+        self._size = end
+        self._changed()
+
+    def _changed(self):
+        self._version += 1
+        self._id_ranks = None
+        self._order_cache = None
+
+    def _find(self, student_id):
+        n = self._size
+        hits = np.flatnonzero((self._ids[:n] == student_id) & self._alive[:n])
+        return int(hits[0]) if len(hits) else None
+
+    # Writes, mirrored from Database
+
+    def add(self, rows):
+        with self._lock:
+            if self._queued(self.add, rows):
+                return
+            if self._replaying:
+                rows = [row for row in rows if self._find(row[0]) is None]
+            if rows:
+                self._append(list(zip(*rows)))
+
+    def update(self, old_student_id, row):
+        with self._lock:
+            if self._queued(self.update, old_student_id, row):
+                return
+            position = self._find(old_student_id)
+            if position is None:
+                position = self._find(row[0])
+            if position is None:
+                return
+            self._fit_ids([row[0]])
+            self._ids[position] = row[0]
+            self._ages[position] = row[3]
+            self._years[position] = int(row[0][:4]) if row[0][:4].isdigit() else 0
+            for column, value in zip(STORED_COLUMNS, row):
+                if column in self._codes:
+                    self._codes[column][position] = self._dicts[column].code(value)
+            self._changed()
+
+    def remove(self, student_id):
+        with self._lock:
+            if self._queued(self.remove, student_id):
+                return
+            position = self._find(student_id)
+            if position is None:
+                return
+            self._alive[position] = False
+            self._dead += 1
+            if self._dead > 1024 and self._dead * 4 > self._size:
+                self._compact()
+            self._changed()
+
+    def clear(self):
+        with self._lock:
+            if self._queued(self.clear):
+                return
+            college_names, course_names = self.college_names, self.course_names
+            self._reset()
+            self.college_names, self.course_names = college_names, course_names
+
+    def _compact(self):
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._ids = self._ids[keep]
+        self._ages = self._ages[keep]
+        self._years = self._years[keep]
+        self._alive = self._alive[keep]
+        self._codes = {column: codes[keep] for column, codes in self._codes.items()}
+        self._size = len(keep)
+        self._dead = 0
+
+    def _recode(self, column, old, new):
+        """Rename a code value in place: one dictionary entry instead of every row"""
+        code, existing = self._dicts[column].rename(old, new)
+        if existing is not None:
+            codes = self._codes[column]
+            codes[:self._size][codes[:self._size] == code] = existing
+        if code is not None:
+            self._changed()
+
+    def put_college(self, college_code, college_name):
+        with self._lock:
+            if self._queued(self.put_college, college_code, college_name):
+                return
+            self.college_names[college_code] = college_name
+
+    def rename_college(self, old_code, college_code, college_name):
+        with self._lock:
+            if self._queued(self.rename_college, old_code, college_code, college_name):
+                return
+            self.college_names.pop(old_code, None)
+            self.college_names[college_code] = college_name
+            if old_code != college_code:
+                self._recode("college_code", old_code, college_code)
+
+    def remove_college(self, college_code):
+        with self._lock:
+            if self._queued(self.remove_college, college_code):
+                return
+            self.college_names.pop(college_code, None)
+            self._recode("college_code", college_code, None)
+
+    def put_course(self, course_code, course_name):
+        with self._lock:
+            if self._queued(self.put_course, course_code, course_name):
+                return
+            self.course_names[course_code] = course_name
+
+    def rename_course(self, old_code, course_code, course_name):
+        with self._lock:
+            if self._queued(self.rename_course, old_code, course_code, course_name):
+                return
+            self.course_names.pop(old_code, None)
+            self.course_names[course_code] = course_name
+            if old_code != course_code:
+                self._recode("course_code", old_code, course_code)
+
+    def remove_course(self, course_code):
+        with self._lock:
+            if self._queued(self.remove_course, course_code):
+                return
+            self.course_names.pop(course_code, None)
+            self._recode("course_code", course_code, None)
+
+    # Queries
+
+    def _search_mask(self, column, text, mode):
+        text = text.lower()
+        if mode == "fuzzy" and not fuzzy_searchable(text):
+            # As in SQL, where the trigram index hands short terms back to LIKE
+            mode = "contains"
+        if column == "student_id":
+            ids = self._ids[:self._size]
+            if mode == "exact":
+                return ids == text
+            if mode == "fuzzy":
+                index = self.db.trigram_index
+                similar = index.similar("student_id", text) if index is not None and index.ready else None
+                if similar is not None:
+                    return np.isin(ids, similar)
+            if mode in ("contains", "fuzzy"):
+                return np.char.find(ids, text) >= 0
+            return np.char.startswith(ids, text)
+
+        if mode == "exact":
+            predicate = lambda value: (value or "").lower() == text
+        elif mode == "contains":
+            predicate = lambda value: text in (value or "").lower()
+        elif mode == "fuzzy":
+            predicate = lambda value: within_distance(text, (value or "").lower(), 1)
+        else:
+            predicate = lambda value: (value or "").lower().startswith(text)
+        return self._dicts[column].matches(predicate)[self._codes[column][:self._size]]
+
+    def _mask(self, filters):
+        n = self._size
+        mask = self._alive[:n].copy()
+        for field, column in FILTER_COLUMNS.items():
+            if filters.get(field):
+                code = self._dicts[column].codes.get(filters[field])
+                if code is None:
+                    return np.zeros(n, dtype=bool)
+                mask &= self._codes[column][:n] == code
+        if filters.get('enrollment_year'):
+            mask &= self._years[:n] == int(filters['enrollment_year'])
+        for field, column in SEARCH_FIELDS.items():
+            if filters.get(field):
+                mask &= self._search_mask(column, filters[field], filters.get('search_mode'))
+                break
+        return mask
+
+    def _sort_key(self, column, rows):
+        if column == "age":
+            return self._ages[rows]
+        return self._dicts[column].ranks()[self._codes[column][rows]]
+
+    def _student_id_ranks(self):
+        if self._id_ranks is None:
+            n = self._size
+            ranks = np.empty(n, dtype=np.int32)
+            ranks[np.argsort(self._ids[:n], kind="stable")] = np.arange(n, dtype=np.int32)
+            self._id_ranks = ranks
+        return self._id_ranks
+
+    def _ordered(self, filters):
+        """Row positions matching filters, in display order (the last result is cached for paging)"""
+        signature = tuple(sorted(filters.items()))
+        cached = self._order_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        rows = np.flatnonzero(self._mask(filters))
+        sort_by = filters.get('sort_by')
+        if sort_by in STUDENT_SORT_KEYS:
+            columns = () if sort_by == "student_id" else (sort_by,)
+            descending = filters.get('sort_order') == "Descending"
+        else:
+            columns = DEFAULT_SORT
+            descending = False
+        # lexsort takes the least significant key first; student_id breaks ties as in SQL
+        keys = [self._student_id_ranks()[rows]]
+        keys.extend(self._sort_key(column, rows) for column in reversed(columns))
+        ordered = rows[np.lexsort(keys)]
+        if descending:
+            ordered = ordered[::-1]
+        self._order_cache = (signature, ordered)
+        return ordered
+
+    def _rows(self, positions, row_factory=None):
+        build = row_builder(COLUMNS, row_factory)
+        decoded = [
+            [self._dicts[column].values[code] for code in self._codes[column][positions].tolist()]
+            for column in ENCODED_COLUMNS
+        ]
+        first, last, gender, year_level, colleges, courses = decoded
+        return [
+            build(values) for values in zip(
+                self._ids[positions].tolist(), first, last, self._ages[positions].tolist(),
+                gender, year_level, colleges, courses, self._years[positions].tolist(),
+                [self.college_names.get(code) for code in colleges],
+                [self.course_names.get(code) for code in courses]
+            )
+        ]
+
+    def get_students(self, filters=None, row_factory=None):
+        with self._lock:
+            return self._rows(self._ordered(filters or {}), row_factory)
+
+    def get_students_page(self, filters=None, page=1, page_size=20, row_factory=None):
+        start = (max(page, 1) - 1) * page_size
+        with self._lock:
+            return self._rows(self._ordered(filters or {})[start:start + page_size], row_factory)
+
+    def count_students(self, filters=None):
+        with self._lock:
+            return len(self._ordered(filters or {}))
+
+    def fetch(self, filters, page, page_size=20, row_factory=None):
+        """Return (rows, total, page) with page clamped to range, like StudentPager.fetch"""
+        with self._lock:
+            ordered = self._ordered(filters or {})
+            total = len(ordered)
+            page = min(max(page, 1), max(1, -(-total // page_size)))
+            start = (page - 1) * page_size
+            return self._rows(ordered[start:start + page_size], row_factory), total, page
+
+    def aggregate(self, filters=None, column="college_code"):
+        """Count matching students per value of column (an encoded column, 'age' or 'enrollment_year')"""
+        with self._lock:
+            mask = self._mask(filters or {})
+            if column in self._codes:
+                counts = np.bincount(self._codes[column][:self._size][mask], minlength=len(self._dicts[column].values))
+                values = self._dicts[column].values
+                return {values[code]: int(count) for code, count in enumerate(counts) if count}
+            array = self._ages if column == "age" else self._years
+            values, counts = np.unique(array[:self._size][mask], return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
@@ -0,0 +1,257 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from config import SQLITE_CONFIG
+from database.base import Database
+from utils.formats import GENDERS, YEAR_LEVELS
+
+SCHEMA_VERSION = 1
+
+
+def _allowed(column, values):
+    return f"CHECK ({column} IN ({', '.join(repr(value) for value in values)}))"
+
+
+# Text columns compare case-insensitively, as they do under MySQL's default
+# collation. Foreign keys cascade renames and null out deleted parents, the
+# same as the MySQL schema.
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS colleges (
+        college_code TEXT COLLATE NOCASE PRIMARY KEY,
+        college_name TEXT COLLATE NOCASE NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        course_code TEXT COLLATE NOCASE PRIMARY KEY,
+        course_name TEXT COLLATE NOCASE NOT NULL,
+        college_code TEXT COLLATE NOCASE
+            REFERENCES colleges(college_code) ON UPDATE CASCADE ON DELETE SET NULL
+    ) WITHOUT ROWID
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS students (
+        student_id TEXT COLLATE NOCASE PRIMARY KEY,
+        first_name TEXT COLLATE NOCASE NOT NULL,
+        last_name TEXT COLLATE NOCASE NOT NULL,
+        age INTEGER NOT NULL,
+        gender TEXT NOT NULL {_allowed("gender", GENDERS)},
+        year_level TEXT NOT NULL {_allowed("year_level", YEAR_LEVELS)},
+        college_code TEXT COLLATE NOCASE
+            REFERENCES colleges(college_code) ON UPDATE CASCADE ON DELETE SET NULL,
+        course_code TEXT COLLATE NOCASE
+            REFERENCES courses(course_code) ON UPDATE CASCADE ON DELETE SET NULL,
+        enrollment_year INTEGER GENERATED ALWAYS AS (CAST(substr(student_id, 1, 4) AS INTEGER)) STORED
+    ) WITHOUT ROWID
+    """,
+    # Same filter/sort indexes as the MySQL migrations, plus the foreign key
+    # columns that MySQL indexes implicitly (cascades would scan without them)
+    "CREATE INDEX IF NOT EXISTS idx_students_name ON students (last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_first_name ON students (first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_age ON students (age)",
+    "CREATE INDEX IF NOT EXISTS idx_students_college_name ON students (college_code, last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_course ON students (course_code)",
+    "CREATE INDEX IF NOT EXISTS idx_students_year_name ON students (year_level, last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_gender_name ON students (gender, last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_students_enrollment_year ON students (enrollment_year, last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_colleges_name ON colleges (college_name)",
+    "CREATE INDEX IF NOT EXISTS idx_courses_name ON courses (course_name)",
+    "CREATE INDEX IF NOT EXISTS idx_courses_college_name ON courses (college_code, course_name)",
+]
+
+
+def create_schema(connection):
+    """Create any missing tables and indexes; PRAGMA user_version records the schema version"""
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return True
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+        print(f"SQLite schema created (version {SCHEMA_VERSION})")
+    except sqlite3.Error as e:
+        print(f"Error creating SQLite schema: {e}")
+        connection.rollback()
+        return False
+    return True
+
+
+@lru_cache(maxsize=512)
+def _translate(query):
+    return query.replace("%s", "?")
+
+
+class SQLitePool:
+    """Bounded set of connections to one SQLite file.
+
+    The database runs in WAL mode, so readers on other connections are not
+    blocked by a writer; concurrent writers wait up to busy_timeout ms.
+    """
+
+    def __init__(self, path, pool_size=4, busy_timeout=5000, checkout_timeout=10, statement_cache_size=64):
+        self.path = path
+        self.max_size = max(1, pool_size)
+        self.busy_timeout = busy_timeout
+        self.checkout_timeout = checkout_timeout
+        self.statement_cache_size = statement_cache_size
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Open one connection up front so a bad path fails here, not on first query
+        self._idle.append(self._create_connection())
+        self._size = 1
+
+    def _create_connection(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout / 1000,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.OperationalError("Connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(f"No connection available after {self.checkout_timeout}s "
+                                                   f"(pool size {self.max_size})")
+                self._cond.wait(remaining)
+
+        try:
+            return self._create_connection()
+        except sqlite3.Error:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            with self._cond:
+                self._discard(conn)
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def _discard(self, conn):
+        self._size -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._cond:
+            if self._idle:
+                try:
+                    # Refreshes sqlite_stat1 where the planner would benefit (and for count estimates)
+                    self._idle[-1].execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+
+class SQLiteDatabase(Database):
+    """Embedded backend for single-seat installs: no server, same methods as MySQLDatabase"""
+
+    Error = sqlite3.Error
+    dialect = "sqlite"
+
+    def connect(self):
+        try:
+            self.pool = SQLitePool(**SQLITE_CONFIG)
+            print(f"SQLite database opened at {self.pool.path}")
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite database: {e}")
+            return
+        self.migrate()
+
+    def migrate(self):
+        try:
+            with self._connection() as connection:
+                return create_schema(connection)
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite schema: {e}")
+            return False
+
+    def setup(self):
+        if self.pool is None:
+            self.connect()
+        return self.pool is not None and self.migrate()
+
+    def _sql(self, query):
+        return _translate(query)
+
+    def _estimate_rows(self, clauses, params):
+        # sqlite_stat1 only exists once ANALYZE or PRAGMA optimize has run;
+        # its first figure for any of the table's indexes is the row count
+        if clauses:
+            return None
+        analyzed = self.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'",
+            fetch=True, label="estimate_student_count"
+        )
+        if not analyzed:
+            return None
+        rows = self.execute_query(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = 'students' LIMIT 1",
+            fetch=True, label="estimate_student_count"
+        )
+        if not rows:
+            return None
+        return int(rows[0]['stat'].split()[0])
+
+    def _explain(self, connection, query, params):
+        if query.lstrip().split(None, 1)[0].upper() not in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+            return None
+        cursor = connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + self._sql(query), params or ())
+            return [row[-1] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            return [f"EXPLAIN failed: {e}"]
+        finally:
+            cursor.close()
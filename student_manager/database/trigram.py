@@ -0,0 +1,181 @@
+import threading
+from collections import Counter
+
+INDEXED_FIELDS = ("student_id", "first_name", "last_name")
+
+
+def _trigrams(text, pad=False):
+    if pad:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def within_distance(a, b, max_edits):
+    """Edit distance check (insert, delete, substitute, swap adjacent) that stops early"""
+    if abs(len(a) - len(b)) > max_edits:
+        return False
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        if min(current) > max_edits:
+            return False
+        before_previous, previous = previous, current
+    return previous[-1] <= max_edits
+
+
+def fuzzy_searchable(text, max_edits=1):
+    """True when text has enough trigrams for similar() to narrow the search"""
+    # An edit destroys at most three padded trigrams, an adjacent swap at most four
+    return len(_trigrams(text.lower(), pad=True)) > 4 * max_edits
+
+
+class _Postings:
+    """The index data itself; TrigramIndex does the locking"""
+
+    def __init__(self):
+        self.doc_ids = {}
+        self.values = {}
+        self.postings = {field: {} for field in INDEXED_FIELDS}
+        self.next_doc = 0
+
+    def add(self, student_id, first_name, last_name):
+        if student_id in self.doc_ids:
+            self.remove(student_id)
+        doc = self.next_doc
+        self.next_doc += 1
+        values = tuple((value or "").lower() for value in (student_id, first_name, last_name))
+        self.doc_ids[student_id] = doc
+        self.values[doc] = (student_id,) + values
+        for field, value in zip(INDEXED_FIELDS, values):
+            postings = self.postings[field]
+            for gram in _trigrams(value, pad=True):
+                postings.setdefault(gram, set()).add(doc)
+
+    def clear(self):
+        self.__init__()
+
+    def remove(self, student_id):
+        doc = self.doc_ids.pop(student_id, None)
+        if doc is None:
+            return
+        values = self.values.pop(doc)[1:]
+        for field, value in zip(INDEXED_FIELDS, values):
+            postings = self.postings[field]
+            for gram in _trigrams(value, pad=True):
+                docs = postings.get(gram)
+                if docs is not None:
+                    docs.discard(doc)
+                    if not docs:
+                        del postings[gram]
+
+
+class TrigramIndex:
+    """In-memory trigram index over student IDs and names.
+
+    Answers substring and small-edit-distance queries with candidate
+    student IDs, which get_students then hydrates with an IN (...) lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = _Postings()
+        # Writes made while build() reads, replayed onto the new data before it is swapped in
+        self._pending = None
+        self.ready = False
+
+    def __len__(self):
+        return len(self._data.doc_ids)
+
+    def build(self, rows):
+        """Index (student_id, first_name, last_name) rows from a streaming read.
+
+        The rows are indexed outside the lock, so writers are not held up
+        for the length of the read.
+        """
+        with self._lock:
+            self._pending = []
+        data = _Postings()
+        try:
+            for row in rows:
+                data.add(*row)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for method, args in self._pending:
+                getattr(data, method)(*args)
+            self._pending = None
+            self._data = data
+            self.ready = True
+
+    def _write(self, method, *args):
+        with self._lock:
+            getattr(self._data, method)(*args)
+            if self._pending is not None:
+                self._pending.append((method, args))
+
+    def add(self, student_id, first_name, last_name):
+        self._write("add", student_id, first_name, last_name)
+
+    def remove(self, student_id):
+        self._write("remove", student_id)
+
+    def update(self, old_student_id, student_id, first_name, last_name):
+        with self._lock:
+            self.remove(old_student_id)
+            self.add(student_id, first_name, last_name)
+
+    def clear(self):
+        self._write("clear")
+
+    def contains(self, field, text):
+        """Return the IDs of students whose field contains text (case-insensitive).
+
+        None when text is too short to have a trigram: that would check every student.
+        """
+        text = text.lower()
+        position = INDEXED_FIELDS.index(field) + 1
+        with self._lock:
+            grams = _trigrams(text)
+            if not grams:
+                return None
+            postings = self._data.postings[field]
+            lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+            docs = set(lists[0]).intersection(*lists[1:])
+            return [
+                self._data.values[doc][0] for doc in docs
+                if text in self._data.values[doc][position]
+            ]
+
+    def similar(self, field, text, max_edits=1):
+        """Return the IDs of students whose field is within max_edits edits of text.
+
+        None when text is too short for its trigrams to narrow the search.
+        """
+        text = text.lower()
+        position = INDEXED_FIELDS.index(field) + 1
+        with self._lock:
+            if not fuzzy_searchable(text, max_edits):
+                return None
+            grams = _trigrams(text, pad=True)
+            threshold = len(grams) - 4 * max_edits
+            postings = self._data.postings[field]
+            hits = Counter()
+            for gram in grams:
+                hits.update(postings.get(gram, ()))
+            docs = [doc for doc, count in hits.items() if count >= threshold]
+            return [
+                self._data.values[doc][0] for doc in docs
+                if within_distance(text, self._data.values[doc][position], max_edits)
+            ]
@@ -0,0 +1,119 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DatabaseExecutor:
+    """Runs database calls on worker threads and delivers results on the Tk thread.
+
+    Worker threads never touch Tk: finished futures are queued and drained by
+    a root.after() poll. Submissions sharing a `key` supersede each other, so
+    only the result of the newest one is delivered.
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=20):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._generations = {}
+        self._futures = {}
+        self._pending = 0
+        self._busy_listeners = []
+        self._closed = False
+        self._poll()
+
+    def submit(self, fn, *args, callback=None, errback=None, key=None, owner=None, silent=False, **kwargs):
+        """Run fn(*args, **kwargs) off the Tk thread.
+
+        callback(result) or errback(exception) is called on the Tk thread,
+        unless a newer submission with the same key was made in the meantime
+        or the owner widget has been destroyed. Silent submissions (prefetches)
+        do not count towards busy.
+        """
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+
+        if not silent:
+            self._set_pending(self._pending + 1)
+        future = self._executor.submit(fn, *args, **kwargs)
+        if key is not None:
+            self._futures[key] = future
+        future.add_done_callback(
+            lambda f: self._results.put((f, callback, errback, key, generation, owner, silent))
+        )
+        return future
+
+    def post(self, fn, *args, **kwargs):
+        """Schedule fn on the Tk thread; safe to call from a worker"""
+        self._results.put((None, lambda _: fn(*args, **kwargs), None, None, None, None, True))
+
+    def is_current(self, key, future):
+        return self._futures.get(key) is future
+
+    def add_busy_listener(self, listener):
+        self._busy_listeners.append(listener)
+
+    def remove_busy_listener(self, listener):
+        if listener in self._busy_listeners:
+            self._busy_listeners.remove(listener)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def _set_pending(self, pending):
+        was_busy = self.busy
+        self._pending = pending
+        if was_busy != self.busy:
+            for listener in list(self._busy_listeners):
+                listener(self.busy)
+
+    def _poll(self):
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._deliver(*item)
+
+        if not self._closed:
+            self.root.after(self.poll_interval, self._poll)
+
+    def _deliver(self, future, callback, errback, key, generation, owner, silent):
+        if future is None:
+            callback(None)
+            return
+
+        if not silent:
+            self._set_pending(self._pending - 1)
+        if key is not None and self._futures.get(key) is future:
+            del self._futures[key]
+
+        if future.cancelled():
+            return
+        if key is not None and self._generations.get(key) != generation:
+            return
+        try:
+            if owner is not None and not owner.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        error = future.exception()
+        if error is not None:
+            if errback:
+                errback(error)
+            else:
+                print(f"Error in background database call: {error}")
+        elif callback:
+            callback(future.result())
+
+    def shutdown(self):
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from config import SEARCH_DEBOUNCE_MS
 from utils.validation import validate_college_code, validate_college_name
+from .background import DatabaseExecutor
+from .widgets import VirtualTreeview
+from .reference_data import ReferenceStore
+
+SORT_COLUMNS = {
+    "College Code": "college_code",
+    "College Name": "college_name",
+    "Number of Courses": "course_count"
+}
 
 class CollegeManager:
     def __init__(self, parent, db, main_window_ref=None):
@@ -14,6 +24,20 @@ class CollegeManager:
         self.window.transient(parent)
         self.window.grab_set()
         
+        self._search_after_id = None
+        self._owns_executor = main_window_ref is None
+        if main_window_ref:
+            self.executor = main_window_ref.executor
+        else:
+            self.executor = DatabaseExecutor(self.window)
+        self.window.bind("<Destroy>", self.on_destroy)
+        
+        if main_window_ref:
+            self.reference = main_window_ref.reference
+        else:
+            self.reference = ReferenceStore(self.db, self.executor)
+            self.reference.load()
+        
         self.setup_ui()
         self.refresh_table()
     
@@ -24,7 +48,7 @@ class CollegeManager:
         tk.Label(main_frame, text="Colleges", font=("Arial", 14, "bold")).pack(pady=10)
         
         self.columns = ("College Code", "College Name", "Number of Courses")
-        self.college_table = ttk.Treeview(main_frame, columns=self.columns, show="headings", height=15)
+        self.college_table = VirtualTreeview(main_frame, self.columns, height=15)
         
         for col in self.columns:
             self.college_table.heading(col, text=col)
@@ -41,8 +65,7 @@ class CollegeManager:
         
         self.setup_search_sort_controls(main_frame)
         
-        self.college_table.bind("<Button-1>", self.on_click)
-        self._last_selected = None
+        self.college_table.tree.bind("<Button-1>", self.on_click)
     
     def setup_search_sort_controls(self, parent):
         search_frame = tk.Frame(parent)
@@ -85,68 +108,81 @@ class CollegeManager:
         ).pack(side=tk.LEFT, padx=5)
     
     def on_click(self, event):
-        region = self.college_table.identify("region", event.x, event.y)
+        region = self.college_table.tree.identify("region", event.x, event.y)
         if region != "cell":
             return
             
-        item = self.college_table.identify_row(event.y)
-        if not item:
+        index = self.college_table.index_at(event.y)
+        if index is not None and index == self.college_table.selected_index():
+            self.college_table.clear_selection()
+            return "break"
+    
+    def on_destroy(self, event):
+        if event.widget is not self.window:
             return
-            
-        if item == self._last_selected:
-            self.college_table.selection_remove(item)
-            self._last_selected = None
-        else:
-            self._last_selected = item
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        if self._owns_executor:
+            self.executor.shutdown()
     
     def on_search_change(self, *args):
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        self._search_after_id = self.window.after(SEARCH_DEBOUNCE_MS, self.search_colleges)
+    
+    def search_colleges(self):
+        self._search_after_id = None
         self.refresh_table()
     
     def apply_sort(self):
         self.refresh_table()
     
     def refresh_table(self):
-        self.college_table.delete(*self.college_table.get_children())
-        
-        try:
-            query = """
-            SELECT c.college_code, c.college_name, COUNT(co.course_code) as course_count
-            FROM colleges c
-            LEFT JOIN courses co ON c.college_code = co.college_code
-            GROUP BY c.college_code, c.college_name
-            """
-            
-            colleges = self.db.execute_query(query, fetch=True)
-            
-            search_text = self.search_var.get().lower()
-            if search_text:
-                colleges = [
-                    c for c in colleges 
-                    if (search_text in c['college_code'].lower() or 
-                        search_text in c['college_name'].lower())
-                ]
-            
-            sort_by = self.sort_var.get()
-            reverse = self.sort_order.get() == "Descending"
-            
-            if sort_by == "College Code":
-                colleges.sort(key=lambda x: x['college_code'], reverse=reverse)
-            elif sort_by == "College Name":
-                colleges.sort(key=lambda x: x['college_name'], reverse=reverse)
-            else:  
-                colleges.sort(key=lambda x: x['course_count'], reverse=reverse)
+        # Count first; the table then pulls pages of rows as it scrolls
+        query = (
+            self.search_var.get().strip(),
+            SORT_COLUMNS.get(self.sort_var.get(), "college_code"),
+            self.sort_order.get() == "Descending"
+        )
+        self.executor.submit(
+            self.count_colleges,
+            query[0],
+            callback=lambda total: self.render_table(total, query),
+            errback=self.on_refresh_error,
+            key="college_table",
+            owner=self.window
+        )
+    
+    def count_colleges(self, search_text):
+        total = self.db.count_colleges(search_text)
+        if total is None:
+            raise RuntimeError("Could not count colleges")
+        return total
+    
+    def load_colleges(self, search_text, sort_by, descending, limit, offset):
+        colleges = self.db.get_college_page(search_text, sort_by, descending, limit, offset)
+        if colleges is False:
+            raise RuntimeError("Could not load colleges")
+        return [(c['college_code'], c['college_name'], c['course_count']) for c in colleges]
+    
+    def render_table(self, total, query):
+        def fetch(start, count, done):
+            def failed(e):
+                done(None)
+                self.on_refresh_error(e)
             
-           
-            for college in colleges:
-                self.college_table.insert("", "end", values=(
-                    college['college_code'],
-                    college['college_name'],
-                    college['course_count']
-                ))
-                
-        except Exception as e:
-            print(f"Error refreshing college table: {e}")
-            messagebox.showerror("Error", "Failed to refresh college table")
+            self.executor.submit(
+                self.load_colleges, *query, count, start,
+                callback=done,
+                errback=failed,
+                owner=self.window
+            )
+        
+        self.college_table.set_source(total, fetch)
+    
+    def on_refresh_error(self, e):
+        print(f"Error refreshing college table: {e}")
+        messagebox.showerror("Error", f"Failed to refresh college table: {e}")
     
     def add_college(self):
         add_dialog = tk.Toplevel(self.window)
@@ -177,44 +213,48 @@ class CollegeManager:
             if not validate_college_name(name):
                 return
                 
-            existing = self.db.execute_query(
-                "SELECT college_code FROM colleges WHERE college_code = %s",
-                (code,),
-                fetch=True
-            )
-            
-            if existing:
-                messagebox.showerror("Duplicate", f"College with code {code} already exists")
-                return
-            
-            existing_name = self.db.execute_query(
-                "SELECT college_name FROM colleges WHERE college_name = %s",
-                (name,),
-                fetch=True
-            )
+            def persist():
+                existing = self.db.execute_query(
+                    "SELECT college_code FROM colleges WHERE college_code = %s",
+                    (code,),
+                    fetch=True
+                )
+                
+                if existing:
+                    return f"College with code {code} already exists"
+                
+                existing_name = self.db.execute_query(
+                    "SELECT college_name FROM colleges WHERE college_name = %s",
+                    (name,),
+                    fetch=True
+                )
+                
+                if existing_name:
+                    return f"College with name {name} already exists"
+                
+                return self.db.add_college(code, name)
             
-            if existing_name:
-                messagebox.showerror("Duplicate", f"College with name {name} already exists")
-                return
+            def on_saved(result):
+                if isinstance(result, str):
+                    messagebox.showerror("Duplicate", result)
+                elif result:
+                    messagebox.showinfo("Success", "College added successfully")
+                    self.refresh_table()
+                    self.reference.put_college(code, name)
+                    add_dialog.destroy()
+                else:
+                    messagebox.showerror("Error", "Failed to add college")
             
-            if self.db.add_college(code, name):
-                messagebox.showinfo("Success", "College added successfully")
-                self.refresh_table()
-                if self.main_window_ref:
-                    self.main_window_ref.refresh_filter_values()
-                add_dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to add college")
+            self.executor.submit(persist, callback=on_saved, owner=add_dialog)
         
         tk.Button(add_dialog, text="Save", command=save).pack(pady=10)
     
     def edit_college(self):
-        selected = self.college_table.selection()
-        if not selected:
+        values = self.college_table.selected_row()
+        if values is None:
             messagebox.showwarning("No Selection", "Please select a college to edit.")
             return
             
-        values = self.college_table.item(selected)['values']
         if len(values) < 2:
             messagebox.showerror("Error", "Invalid selection data")
             return
@@ -251,47 +291,52 @@ class CollegeManager:
             if not validate_college_name(new_name):
                 return
                 
-            if new_code != current_code:
-                existing = self.db.execute_query(
-                    "SELECT college_code FROM colleges WHERE college_code = %s",
-                    (new_code,),
-                    fetch=True
-                )
-                
-                if existing:
-                    messagebox.showerror("Duplicate", f"College with code {new_code} already exists")
-                    return
+            def persist():
+                if new_code != current_code:
+                    existing = self.db.execute_query(
+                        "SELECT college_code FROM colleges WHERE college_code = %s",
+                        (new_code,),
+                        fetch=True
+                    )
+                    
+                    if existing:
+                        return f"College with code {new_code} already exists"
 
-            if new_name != current_name:
-                existing_name = self.db.execute_query(
-                    "SELECT college_name FROM colleges WHERE college_name = %s",
-                    (new_name,),
-                    fetch=True
-                )
+                if new_name != current_name:
+                    existing_name = self.db.execute_query(
+                        "SELECT college_name FROM colleges WHERE college_name = %s",
+                        (new_name,),
+                        fetch=True
+                    )
+                    
+                    if existing_name:
+                        return f"College with name {new_name} already exists"
                 
-                if existing_name:
-                    messagebox.showerror("Duplicate", f"College with name {new_name} already exists")
-                    return
+                return self.db.update_college(current_code, new_code, new_name)
             
-            if self.db.update_college(current_code, new_code, new_name):
-                messagebox.showinfo("Success", "College updated successfully", parent=edit_dialog)
-                self.refresh_table()
-                if self.main_window_ref:
-                    self.main_window_ref.refresh_filter_values()
-                    self.main_window_ref.refresh_table()  
-                edit_dialog.destroy()
-            else:
+            def on_saved(result):
+                if isinstance(result, str):
+                    messagebox.showerror("Duplicate", result)
+                elif result:
+                    messagebox.showinfo("Success", "College updated successfully", parent=edit_dialog)
+                    self.refresh_table()
+                    self.reference.put_college(new_code, new_name, current_code)
+                    if self.main_window_ref:
+                        self.main_window_ref.refresh_table()
+                    edit_dialog.destroy()
+                else:
                     messagebox.showerror("Error", "Failed to update college", parent=edit_dialog)
             
+            self.executor.submit(persist, callback=on_saved, owner=edit_dialog)
+            
         tk.Button(edit_dialog, text="Save Changes", command=save).pack(pady=10)
     
     def delete_college(self):
-        selected = self.college_table.selection()
-        if not selected:
+        values = self.college_table.selected_row()
+        if values is None:
             messagebox.showwarning("No Selection", "Please select a college to delete.")
             return
 
-        values = self.college_table.item(selected)['values']
         if len(values) < 2:
             messagebox.showerror("Error", "Invalid selection data")
             return
@@ -305,33 +350,24 @@ class CollegeManager:
         )
         
         if confirm:
-            try:
-                update_students_query = """
-                UPDATE students 
-                SET college_code = NULL 
-                WHERE college_code = %s
-                """
-                self.db.execute_query(update_students_query, (college_code,))
-                
-                update_courses_query = """
-                UPDATE courses 
-                SET college_code = NULL 
-                WHERE college_code = %s
-                """
-                self.db.execute_query(update_courses_query, (college_code,))
-                
-                delete_query = "DELETE FROM colleges WHERE college_code = %s"
-                if self.db.execute_query(delete_query, (college_code,)):
+            def on_deleted(success):
+                if success:
                     messagebox.showinfo(
                         "College Deleted", 
                         f"College '{college_code} - {college_name}' has been deleted.\n"
                         "Courses were unassigned from this college."
                     )
                     self.refresh_table()
+                    self.reference.remove_college(college_code)
                     if self.main_window_ref:
-                        self.main_window_ref.refresh_filter_values()
                         self.main_window_ref.refresh_table()
                 else:
                     messagebox.showerror("Error", "Failed to delete college")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete college: {str(e)}")
\ No newline at end of file
+            
+            self.executor.submit(
+                self.db.delete_college,
+                college_code,
+                callback=on_deleted,
+                errback=lambda e: messagebox.showerror("Error", f"Failed to delete college: {str(e)}"),
+                owner=self.window
+            )
\ No newline at end of file
@@ -1,6 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from config import SEARCH_DEBOUNCE_MS
 from utils.validation import validate_course_code, validate_course_name
+from .background import DatabaseExecutor
+from .widgets import VirtualTreeview
+from .reference_data import ReferenceStore, ComboboxOptions
+
+SEARCH_COLUMNS = {
+    "Course Code": "course_code",
+    "Code Starts With": "course_code_prefix",
+    "Course Name": "course_name"
+}
+SORT_COLUMNS = {"Course Code": "course_code", "Course Name": "course_name", "College": "college_name"}
 
 class CourseManager:
     def __init__(self, parent, db, main_window_ref=None):
@@ -13,6 +24,20 @@ class CourseManager:
         self.window.transient(parent)
         self.window.grab_set()
         
+        self._search_after_id = None
+        self._owns_executor = main_window_ref is None
+        if main_window_ref:
+            self.executor = main_window_ref.executor
+        else:
+            self.executor = DatabaseExecutor(self.window)
+        self.window.bind("<Destroy>", self.on_destroy)
+        
+        if main_window_ref:
+            self.reference = main_window_ref.reference
+        else:
+            self.reference = ReferenceStore(self.db, self.executor)
+            self.reference.load()
+        
         self.setup_ui()
         self.refresh_table()
 
@@ -34,6 +59,7 @@ class CourseManager:
             width=30
         )
         self.college_filter.pack(side=tk.LEFT, padx=5)
+        ComboboxOptions(self.reference, self.college_filter, "colleges", leading=["All Colleges"])
         
         tk.Button(
             filter_frame, 
@@ -42,7 +68,7 @@ class CourseManager:
         ).pack(side=tk.LEFT, padx=5)
         
         self.columns = ("Course Code", "Course Name", "College")
-        self.course_table = ttk.Treeview(main_frame, columns=self.columns, show="headings")
+        self.course_table = VirtualTreeview(main_frame, self.columns)
         
         for col in self.columns:
             self.course_table.heading(col, text=col)
@@ -62,10 +88,7 @@ class CourseManager:
         
         self.setup_search_sort_controls(main_frame)
         
-        self.course_table.bind("<Button-1>", self.on_click)
-        self._last_selected = None
-        
-        self.load_college_filter_options()
+        self.course_table.tree.bind("<Button-1>", self.on_click)
 
     def setup_search_sort_controls(self, parent):
         search_frame = tk.Frame(parent)
@@ -80,9 +103,9 @@ class CourseManager:
         search_by_options = ttk.Combobox(
             search_frame, 
             textvariable=self.search_by_var,
-            values=["Course Code", "Course Name"],
+            values=list(SEARCH_COLUMNS),
             state='readonly',
-            width=15
+            width=17
         )
         search_by_options.pack(side=tk.LEFT, padx=5)
         
@@ -118,81 +141,90 @@ class CourseManager:
             command=self.apply_sort
         ).pack(side=tk.LEFT, padx=5)
 
-    def load_college_filter_options(self):
-        colleges = self.db.get_colleges()
-        college_values = ["All Colleges"] + [f"{col['college_code']} - {col['college_name']}" for col in colleges]
-        self.college_filter['values'] = college_values
-
     def on_click(self, event):
-        region = self.course_table.identify("region", event.x, event.y)
+        region = self.course_table.tree.identify("region", event.x, event.y)
         if region != "cell":
             return
             
-        item = self.course_table.identify_row(event.y)
-        if not item:
+        index = self.course_table.index_at(event.y)
+        if index is not None and index == self.course_table.selected_index():
+            self.course_table.clear_selection()
+            return "break"
+
+    def on_destroy(self, event):
+        if event.widget is not self.window:
             return
-            
-        if item == self._last_selected:
-            self.course_table.selection_remove(item)
-            self._last_selected = None
-        else:
-            self._last_selected = item
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        if self._owns_executor:
+            self.executor.shutdown()
 
     def on_search_change(self, *args):
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        self._search_after_id = self.window.after(SEARCH_DEBOUNCE_MS, self.search_courses)
+
+    def search_courses(self):
+        self._search_after_id = None
         self.refresh_table()
 
     def apply_sort(self):
         self.refresh_table()
 
     def refresh_table(self):
-        self.course_table.delete(*self.course_table.get_children())
-        
-        try:
-            query = """
-            SELECT c.course_code, c.course_name, co.college_code, co.college_name
-            FROM courses c
-            LEFT JOIN colleges co ON c.college_code = co.college_code
-            """
-            
-            selected_college = self.college_filter_var.get()
-            if selected_college and selected_college != "All Colleges":
-                college_code = selected_college.split(' - ')[0]
-                query += " WHERE c.college_code = %s"
-                params = (college_code,)
-            else:
-                params = None
-            
-            courses = self.db.execute_query(query, params, fetch=True)
-            
-            search_text = self.search_var.get().lower()
-            search_by = self.search_by_var.get()
-            
-            if search_text:
-                if search_by == "Course Code":
-                    courses = [c for c in courses if search_text in c['course_code'].lower()]
-                elif search_by == "Course Name":
-                    courses = [c for c in courses if search_text in c['course_name'].lower()]
-            
-            sort_by = self.sort_var.get()
-            reverse = self.sort_order.get() == "Descending"
-            
-            if sort_by == "Course Code":
-                courses.sort(key=lambda x: x['course_code'], reverse=reverse)
-            elif sort_by == "Course Name":
-                courses.sort(key=lambda x: x['course_name'], reverse=reverse)
-            else:  
-                courses.sort(key=lambda x: x['college_name'] or "", reverse=reverse)
+        # Count first; the table then pulls pages of rows as it scrolls
+        selected_college = self.college_filter_var.get()
+        if selected_college and selected_college != "All Colleges":
+            college_code = selected_college.split(' - ')[0]
+        else:
+            college_code = None
+        
+        query = (
+            college_code,
+            self.search_var.get().strip(),
+            SEARCH_COLUMNS.get(self.search_by_var.get(), "course_code"),
+            SORT_COLUMNS.get(self.sort_var.get(), "course_code"),
+            self.sort_order.get() == "Descending"
+        )
+        self.executor.submit(
+            self.count_courses,
+            *query[:3],
+            callback=lambda total: self.render_table(total, query),
+            errback=self.on_refresh_error,
+            key="course_table",
+            owner=self.window
+        )
+
+    def count_courses(self, college_code, search_text, search_by):
+        total = self.db.count_courses(college_code, search_text, search_by)
+        if total is None:
+            raise RuntimeError("Could not count courses")
+        return total
+
+    def load_courses(self, college_code, search_text, search_by, sort_by, descending, limit, offset):
+        courses = self.db.get_course_page(college_code, search_text, search_by, sort_by, descending, limit, offset)
+        if courses is False:
+            raise RuntimeError("Could not load courses")
+        return [(c['course_code'], c['course_name'], c['college_code'] or "N/A") for c in courses]
+
+    def render_table(self, total, query):
+        def fetch(start, count, done):
+            def failed(e):
+                done(None)
+                self.on_refresh_error(e)
             
-            for course in courses:
-                self.course_table.insert("", "end", values=(
-                    course['course_code'],
-                    course['course_name'],
-                    course['college_code'] if course['college_code'] else "N/A"
-                ))
-                
-        except Exception as e:
-            print(f"Error refreshing course table: {e}")
-            messagebox.showerror("Error", "Failed to refresh course table")
+            self.executor.submit(
+                self.load_courses, *query, count, start,
+                callback=done,
+                errback=failed,
+                owner=self.window
+            )
+        
+        self.course_table.set_source(total, fetch)
+
+    def on_refresh_error(self, e):
+        print(f"Error refreshing course table: {e}")
+        messagebox.showerror("Error", f"Failed to refresh course table: {e}")
 
     def add_course(self):
         add_dialog = tk.Toplevel(self.window)
@@ -212,16 +244,14 @@ class CourseManager:
         tk.Label(add_dialog, text="Select College:").pack(pady=5)
         
         self.college_var = tk.StringVar()
-        colleges = self.db.get_colleges()
-        college_options = [f"{col['college_code']} - {col['college_name']}" for col in colleges]
         college_dropdown = ttk.Combobox(
             add_dialog, 
             textvariable=self.college_var,
-            values=college_options,
             state='readonly',
             width=40
         )
         college_dropdown.pack(pady=5)
+        ComboboxOptions(self.reference, college_dropdown, "colleges")
         
         if self.college_filter_var.get() != "All Colleges":
             self.college_var.set(self.college_filter_var.get())
@@ -243,44 +273,50 @@ class CourseManager:
                 
             college_code = college.split(' - ')[0]
             
-            existing = self.db.execute_query(
-                "SELECT course_code FROM courses WHERE course_code = %s",
-                (code,),
-                fetch=True
-            )
-            
-            if existing:
-                messagebox.showerror("Duplicate", f"Course with code {code} already exists")
-                return
+            def persist():
+                existing = self.db.execute_query(
+                    "SELECT course_code FROM courses WHERE course_code = %s",
+                    (code,),
+                    fetch=True
+                )
+                
+                if existing:
+                    return f"Course with code {code} already exists"
+                
+                existing_name = self.db.execute_query(
+                    "SELECT course_name FROM courses WHERE course_name = %s",
+                    (name,),
+                    fetch=True
+                )
+                
+                if existing_name:
+                    return f"Course with name {name} already exists"
+                
+                return self.db.add_course(code, name, college_code)
             
-            existing_name = self.db.execute_query(
-                "SELECT course_name FROM courses WHERE course_name = %s",
-                (name,),
-                fetch=True
-            )
+            def on_saved(result):
+                if isinstance(result, str):
+                    messagebox.showerror("Duplicate", result)
+                elif result:
+                    messagebox.showinfo("Success", "Course added successfully")
+                    self.refresh_table()
+                    self.reference.put_course(code, name, college_code)
+                    if self.main_window_ref:
+                        self.main_window_ref.refresh_table()
+                    add_dialog.destroy()
+                else:
+                    messagebox.showerror("Error", "Failed to add course")
             
-            if existing_name:
-                messagebox.showerror("Duplicate", f"Course with name {name} already exists")
-                return
-                
-            if self.db.add_course(code, name, college_code):
-                messagebox.showinfo("Success", "Course added successfully")
-                self.refresh_table()
-                if self.main_window_ref:
-                    self.main_window_ref.refresh_table()
-                add_dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to add course")
+            self.executor.submit(persist, callback=on_saved, owner=add_dialog)
         
         tk.Button(add_dialog, text="Save", command=save).pack(pady=10)
 
     def edit_course(self):
-        selected = self.course_table.selection()
-        if not selected:
+        values = self.course_table.selected_row()
+        if values is None:
             messagebox.showwarning("No Selection", "Please select a course to edit.")
             return
             
-        values = self.course_table.item(selected)['values']
         if len(values) < 3:
             messagebox.showerror("Error", "Invalid selection data")
             return
@@ -306,19 +342,17 @@ class CourseManager:
         tk.Label(edit_dialog, text="Select College:").pack(pady=5)
         
         self.college_var = tk.StringVar()
-        colleges = self.db.get_colleges()
-        college_options = [f"{col['college_code']} - {col['college_name']}" for col in colleges]
         college_dropdown = ttk.Combobox(
             edit_dialog, 
             textvariable=self.college_var,
-            values=college_options,
             state='readonly',
             width=40
         )
         college_dropdown.pack(pady=5)
+        ComboboxOptions(self.reference, college_dropdown, "colleges")
         
         if current_college != "N/A":
-            self.college_var.set(current_college)
+            self.college_var.set(self.reference.college_label(current_college) or current_college)
         
         def save():
             new_code = code_entry.get().strip().upper()
@@ -337,46 +371,52 @@ class CourseManager:
                 
             college_code = college.split(' - ')[0]
             
-            if new_code != current_code:
-                existing = self.db.execute_query(
-                    "SELECT course_code FROM courses WHERE course_code = %s",
-                    (new_code,),
-                    fetch=True
-                )
-                
-                if existing:
-                    messagebox.showerror("Duplicate", f"Course with code {new_code} already exists")
-                    return
-                
-            if new_name != current_name:
-                existing_name = self.db.execute_query(
-                    "SELECT course_name FROM courses WHERE course_name = %s",
-                    (new_name,),
-                    fetch=True
-                )
-                
-                if existing_name:
-                    messagebox.showerror("Duplicate", f"Course with name {new_name} already exists")
-                    return
+            def persist():
+                if new_code != current_code:
+                    existing = self.db.execute_query(
+                        "SELECT course_code FROM courses WHERE course_code = %s",
+                        (new_code,),
+                        fetch=True
+                    )
+                    
+                    if existing:
+                        return f"Course with code {new_code} already exists"
+                    
+                if new_name != current_name:
+                    existing_name = self.db.execute_query(
+                        "SELECT course_name FROM courses WHERE course_name = %s",
+                        (new_name,),
+                        fetch=True
+                    )
+                    
+                    if existing_name:
+                        return f"Course with name {new_name} already exists"
 
-            if self.db.update_course(current_code, new_code, new_name, college_code):
-                messagebox.showinfo("Success", "Course updated successfully")
-                self.refresh_table()
-                if self.main_window_ref:
-                    self.main_window_ref.refresh_table()
-                edit_dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to update course")
+                return self.db.update_course(current_code, new_code, new_name, college_code)
+            
+            def on_saved(result):
+                if isinstance(result, str):
+                    messagebox.showerror("Duplicate", result)
+                elif result:
+                    messagebox.showinfo("Success", "Course updated successfully")
+                    self.refresh_table()
+                    self.reference.put_course(new_code, new_name, college_code, current_code)
+                    if self.main_window_ref:
+                        self.main_window_ref.refresh_table()
+                    edit_dialog.destroy()
+                else:
+                    messagebox.showerror("Error", "Failed to update course")
+            
+            self.executor.submit(persist, callback=on_saved, owner=edit_dialog)
             
         tk.Button(edit_dialog, text="Save Changes", command=save).pack(pady=10)
 
     def delete_course(self):
-        selected = self.course_table.selection()
-        if not selected:
+        values = self.course_table.selected_row()
+        if values is None:
             messagebox.showwarning("No Selection", "Please select a course to delete.")
             return
 
-        values = self.course_table.item(selected)['values']
         if len(values) < 1:
             messagebox.showerror("Error", "Invalid selection data")
             return
@@ -389,13 +429,17 @@ class CourseManager:
         )
         
         if confirm:
-            if self.db.delete_course(course_code):
-                messagebox.showinfo(
-                    "Success", 
-                    f"Course '{values[0]} - {values[1]}' deleted successfully"
-                )
-                self.refresh_table()
-                if self.main_window_ref:
-                    self.main_window_ref.refresh_table()
-            else:
-                messagebox.showerror("Error", "Failed to delete course")
\ No newline at end of file
+            def on_deleted(success):
+                if success:
+                    messagebox.showinfo(
+                        "Success", 
+                        f"Course '{values[0]} - {values[1]}' deleted successfully"
+                    )
+                    self.refresh_table()
+                    self.reference.remove_course(course_code)
+                    if self.main_window_ref:
+                        self.main_window_ref.refresh_table()
+                else:
+                    messagebox.showerror("Error", "Failed to delete course")
+            
+            self.executor.submit(self.db.delete_course, course_code, callback=on_deleted, owner=self.window)
\ No newline at end of file
@@ -1,16 +1,35 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-from database.mysql_db import MySQLDatabase
+from tkinter import filedialog
+from collections import OrderedDict
+from config import (SEARCH_DEBOUNCE_MS, SEARCH_CANDIDATE_LIMIT, TRIGRAM_INDEX_ENABLED,
+                    STUDENT_SNAPSHOT_ENABLED, PAGE_CACHE_SIZE, PAGE_PREFETCH_ENABLED)
+from database.pagination import StudentPager
+from database.search_cache import SearchNarrower, SEARCH_FIELDS
+from database.query_builder import student_row_sort
+from database.counts import count_signature
+from database.models import Student
 from utils.validation import validate_id_format
-from .widgets import ValidatedEntry, LabelInput
+from .widgets import ValidatedEntry, LabelInput, VirtualTreeview
+from .background import DatabaseExecutor
+from .reference_data import ReferenceStore, ComboboxOptions
 from .college_manager import CollegeManager
 from .course_manager import CourseManager
 
+SEARCH_MODES = {
+    "Starts with": "prefix",
+    "Exact": "exact",
+    "Contains": "contains",
+    "Similar": "fuzzy"
+}
+
 class MainWindow:
     def __init__(self, root, db):
         self.root = root
-        self.db = MySQLDatabase()
+        self.db = db
+        self.executor = DatabaseExecutor(self.root, max_workers=self.db.pool.max_size)
+        self.reference = ReferenceStore(self.db, self.executor)
         self.setup_ui()
         self.load_initial_data()
         
@@ -19,6 +38,8 @@ class MainWindow:
         self.root.geometry("1400x600")
         self.root.configure(bg="#8B0000")
         
+        self.setup_menu()
+        
         main_frame = tk.Frame(self.root, bg="#8B0000")
         main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
@@ -53,9 +74,24 @@ class MainWindow:
         )
         search_by.pack(pady=2)
         
-        self.entry_search = tk.Entry(self.control_frame, width=15, font=('Arial', 8))
-        self.entry_search.bind("<KeyRelease>", self.search_student)
+        self.search_mode_var = tk.StringVar(value="Starts with")
+        search_mode = ttk.Combobox(
+            self.control_frame, 
+            textvariable=self.search_mode_var,
+            values=list(SEARCH_MODES),
+            state='readonly',
+            width=12,
+            font=('Arial', 8)
+        )
+        search_mode.pack(pady=2)
+        
+        self.search_text = tk.StringVar()
+        self.entry_search = tk.Entry(self.control_frame, textvariable=self.search_text, width=15, font=('Arial', 8))
         self.entry_search.pack(pady=5)
+        self._search_after_id = None
+        self.search_text.trace_add("write", self.on_search_change)
+        self.search_var.trace_add("write", self.on_search_change)
+        self.search_mode_var.trace_add("write", self.on_search_change)
         
         tk.Button(self.control_frame, text="Clear Data", command=self.clear_all_students, **button_style).pack(pady=10, padx=5)
         
@@ -71,6 +107,16 @@ class MainWindow:
         
         self.setup_pagination()
         
+    def setup_menu(self):
+        menubar = tk.Menu(self.root)
+        
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Import Students...", command=self.import_students)
+        file_menu.add_command(label="Export Students...", command=self.export_students)
+        menubar.add_cascade(label="File", menu=file_menu)
+        
+        self.root.config(menu=menubar)
+        
     def setup_filter_sort_controls(self):
         controls_frame = tk.Frame(self.table_frame, bg="#8B0000", height=80)
         controls_frame.pack(fill=tk.X, pady=(0, 5))
@@ -91,6 +137,7 @@ class MainWindow:
             font=('Arial', 8)
         )
         self.college_filter.pack(side=tk.LEFT, padx=2)
+        ComboboxOptions(self.reference, self.college_filter, "colleges", leading=["All Colleges"])
         
         self.year_var = tk.StringVar()
         self.year_filter = ttk.Combobox(
@@ -116,6 +163,18 @@ class MainWindow:
         self.gender_filter.set("All Genders")
         self.gender_filter.pack(side=tk.LEFT, padx=2)
         
+        self.enrollment_var = tk.StringVar()
+        self.enrollment_filter = ttk.Combobox(
+            filter_frame, 
+            textvariable=self.enrollment_var,
+            values=["All Batches"],
+            state='readonly',
+            width=12,
+            font=('Arial', 8)
+        )
+        self.enrollment_filter.set("All Batches")
+        self.enrollment_filter.pack(side=tk.LEFT, padx=2)
+        
         filter_button_style = {
             'bg': '#A0522D',
             'fg': 'white',
@@ -177,7 +236,10 @@ class MainWindow:
         table_container.pack(fill=tk.BOTH, expand=True)
         
         columns = ("ID#", "First Name", "Last Name", "Age", "Gender", "Year Level", "College", "Course")
-        self.table = ttk.Treeview(table_container, columns=columns, show="headings", height=20)
+        self.table = VirtualTreeview(
+            table_container, columns, height=20,
+            display=self.display_values, key=lambda student: student.student_id
+        )
         
         column_widths = {
             "ID#": 80, 
@@ -194,14 +256,12 @@ class MainWindow:
             self.table.heading(col, text=col)
             self.table.column(col, width=column_widths.get(col, 100), minwidth=50)
         
-        v_scrollbar = ttk.Scrollbar(table_container, orient=tk.VERTICAL, command=self.table.yview)
-        h_scrollbar = ttk.Scrollbar(table_container, orient=tk.HORIZONTAL, command=self.table.xview)
-        self.table.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        h_scrollbar = ttk.Scrollbar(table_container, orient=tk.HORIZONTAL, command=self.table.tree.xview)
+        self.table.tree.configure(xscrollcommand=h_scrollbar.set)
         
         self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.table.bind("<Double-1>", lambda e: self.table.selection_remove(self.table.selection()))
+        self.table.tree.bind("<Double-1>", lambda e: self.table.clear_selection())
     
     def setup_pagination(self):
         pagination_frame = tk.Frame(self.table_frame, bg="#8B0000", height=30)
@@ -259,55 +319,281 @@ class MainWindow:
         )
         self.btn_last.pack(side=tk.LEFT, padx=2)
         
+        self.busy_label = tk.Label(
+            pagination_frame, 
+            text="", 
+            bg="#8B0000", 
+            fg="white",
+            font=('Arial', 9, 'italic')
+        )
+        self.busy_label.pack(side=tk.RIGHT, padx=10)
+        self.executor.add_busy_listener(self.on_busy_change)
+        
         self.current_page = 1
         self.rows_per_page = 20
         self.total_pages = 1
+        self.total_students = 0
+        self.count_exact = True
+        self.page_filters = {}
+        # (filter signature, page) -> (write_version, (rows, total, page)), least recent first
+        self.page_cache = OrderedDict()
+        self._page_request = 0
+        self.pager = StudentPager(self.db, self.rows_per_page, row_factory=Student)
+        self.search_narrower = SearchNarrower(self.db, SEARCH_CANDIDATE_LIMIT, row_factory=Student)
+    
+    def on_busy_change(self, busy):
+        self.busy_label.config(text="Loading..." if busy else "")
+        self.root.config(cursor="watch" if busy else "")
     
     def load_initial_data(self):
-        colleges = self.db.get_colleges()
-        college_values = ["All Colleges"] + [f"{col['college_code']} - {col['college_name']}" for col in colleges]
-        self.college_filter['values'] = college_values
-        
+        self.reference.load()
+        self.refresh_enrollment_years()
         self.refresh_table()
+        if TRIGRAM_INDEX_ENABLED:
+            self.executor.submit(self.db.build_trigram_index)
+        if STUDENT_SNAPSHOT_ENABLED:
+            self.executor.submit(self.db.build_snapshot)
+    
+    def refresh_enrollment_years(self):
+        self.executor.submit(
+            self.db.get_enrollment_years,
+            callback=lambda years: self.enrollment_filter.config(values=["All Batches"] + list(years)),
+            key="enrollment_years"
+        )
     
-    def refresh_table(self, students=None):
+    def refresh_table(self):
+        self.page_filters = self.get_current_filters()
+        # A page served from the cache must not be overwritten by an older load still in flight
+        self._page_request += 1
+        request = self._page_request
+        
+        cached = self.cached_page(self.page_filters, self.current_page)
+        if cached is not None:
+            self.render_page(cached)
+            return
+        
+        version = self.db.write_version
+        filters = self.page_filters
+        
+        def on_loaded(result):
+            self.store_page(filters, result, version)
+            if request == self._page_request:
+                self.render_page(result)
+        
+        self.executor.submit(
+            self.load_page, filters, self.current_page,
+            callback=on_loaded,
+            errback=lambda e: messagebox.showerror("Error", f"Failed to load students: {str(e)}"),
+            key="students_page"
+        )
+    
+    def cached_page(self, filters, page):
+        key = (tuple(sorted(filters.items())), page)
+        entry = self.page_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] != self.db.write_version:
+            del self.page_cache[key]
+            return None
+        self.page_cache.move_to_end(key)
+        return entry[1]
+    
+    def store_page(self, filters, result, version):
+        """Cache a loaded page; version is db.write_version from before the load started"""
+        if version != self.db.write_version:
+            return
+        if any(entry[0] != version for entry in self.page_cache.values()):
+            # Everything older than the latest write is stale
+            self.page_cache.clear()
+        self.page_cache[(tuple(sorted(filters.items())), result[2])] = (version, result)
+        while len(self.page_cache) > PAGE_CACHE_SIZE:
+            self.page_cache.popitem(last=False)
+    
+    def prefetch_pages(self):
+        """Load the pages either side of the shown one in the background"""
+        if not PAGE_PREFETCH_ENABLED:
+            return
+        filters = self.page_filters
+        version = self.db.write_version
+        for step, key in ((1, "prefetch_next"), (-1, "prefetch_previous")):
+            page = self.current_page + step
+            if 1 <= page <= self.total_pages and self.cached_page(filters, page) is None:
+                self.executor.submit(
+                    self.load_page, filters, page,
+                    callback=lambda result: self.store_page(filters, result, version),
+                    errback=lambda e: None,
+                    key=key,
+                    silent=True
+                )
+    
+    def load_page(self, filters, page):
+        """Return (rows, total, page, exact); total is an estimate when exact is False"""
+        snapshot = self.db.snapshot
+        if snapshot is not None and snapshot.ready:
+            return snapshot.fetch(filters, page, self.rows_per_page, row_factory=Student) + (True,)
+        
+        students = self.search_narrower.search(filters)
         if students is None:
-            filters = self.get_current_filters()
-            students = self.db.get_students(filters)
-        
-        self.table.delete(*self.table.get_children())
-        
-        self.total_pages = max(1, (len(students) + self.rows_per_page - 1) // self.rows_per_page)
-        self.current_page = min(self.current_page, self.total_pages)
-        
-        start_idx = (self.current_page - 1) * self.rows_per_page
-        end_idx = min(start_idx + self.rows_per_page, len(students))
-        
-        for student in students[start_idx:end_idx]:
-            college_display = "N/A"
-            if student['college_code']:
-                college_display = student['college_code']
-                
-            course_display = "N/A"
-            if student['course_code']:
-                course_display = student['course_code']
-                
-            display_values = (
-                student['student_id'],
-                student['first_name'],
-                student['last_name'],
-                student['age'],
-                student['gender'],
-                student['year_level'],
-                college_display,
-                course_display
-            )
-            self.table.insert("", "end", values=display_values)
+            total, exact = self.db.counts.quick(filters)
+            rows, total, page = self.pager.fetch(filters, page, total, exact)
+            if not rows and page > 1 and not exact:
+                # The estimate ran past the real end: count, then clamp to it
+                total, exact = self.db.counts.exact(filters), True
+                rows, total, page = self.pager.fetch(filters, page, total)
+            return rows, total, page, exact
+        
+        total = len(students)
+        page = min(max(page, 1), self.pager.total_pages(total))
+        start = (page - 1) * self.rows_per_page
+        return students[start:start + self.rows_per_page], total, page, True
+    
+    def render_page(self, result):
+        students, self.total_students, self.current_page, self.count_exact = result
+        self.total_pages = self.pager.total_pages(self.total_students)
+        self.table.set_rows(students)
+        self.update_pagination_info(self.total_students)
+        if not self.count_exact:
+            self.fill_exact_count()
+        self.prefetch_pages()
+    
+    def fill_exact_count(self):
+        """Replace an estimated total with the exact count once it is in"""
+        filters = self.page_filters
         
-        self.update_pagination_info(len(students))
+        def on_counted(total):
+            if count_signature(filters) != count_signature(self.page_filters):
+                return
+            self.total_students = total
+            self.count_exact = True
+            self.total_pages = self.pager.total_pages(total)
+            self.update_pagination_info(total)
+        
+        self.executor.submit(
+            self.db.counts.exact, filters,
+            callback=on_counted,
+            errback=lambda e: print(f"Error counting students: {e}"),
+            key="exact_count",
+            silent=True
+        )
+    
+    def display_values(self, student):
+        return (
+            student.student_id,
+            student.first_name,
+            student.last_name,
+            student.age,
+            student.gender,
+            student.year_level,
+            student.college_code or "N/A",
+            student.course_code or "N/A"
+        )
+    
+    def student_from_data(self, student_data):
+        """Build the table row for a just-written (student_id, ..., course_code) tuple"""
+        student = Student.from_tuple(student_data)
+        student.enrollment_year = int(student.student_id[:4])
+        student.college_name = self.reference.colleges.get(student.college_code)
+        course = self.reference.courses.get(student.course_code)
+        student.course_name = course[0] if course else None
+        return student
+    
+    def matches_page_filters(self, student):
+        """Whether student belongs in the shown result; None when a search decides it"""
+        filters = self.page_filters
+        if any(filters.get(field) for field in SEARCH_FIELDS):
+            return None
+        return (
+            filters.get('college') in (None, student.college_code)
+            and filters.get('year_level') in (None, student.year_level)
+            and filters.get('gender') in (None, student.gender)
+            and filters.get('enrollment_year') in (None, student.enrollment_year)
+        )
+    
+    def patch_student(self, old_student_id, student):
+        """Apply one saved change to the shown page instead of re-running the query.
+        
+        old_student_id is None for an insert; student is None for a delete.
+        """
+        matches = student is not None and self.matches_page_filters(student)
+        if matches is None:
+            self.refresh_table()
+            return
+        
+        if old_student_id is not None:
+            index = self.table.index_of(old_student_id)
+            if index is not None:
+                self.table.remove_row(index)
+                self.total_students -= 1
+        if matches:
+            self.total_students += 1
+            if not self.place_student(student):
+                return
+        
+        self.total_pages = self.pager.total_pages(self.total_students)
+        if self.current_page > self.total_pages or (not self.table.total and self.total_students):
+            self.current_page = min(self.current_page, self.total_pages)
+            self.refresh_table()
+            return
+        if len(self.table.rows) < self.rows_per_page and self.current_page < self.total_pages:
+            self.backfill_page()
+        self.update_pagination_info(self.total_students)
+        self.prefetch_pages()
+    
+    def backfill_page(self):
+        """Refill a page a write left short with the rows that follow its last one"""
+        rows = self.table.rows
+        after = rows[-1]._key if rows else None
+        if after is None:
+            # Rows placed by patch_student or served by the snapshot carry no sort key
+            self.refresh_table()
+            return
+        request = self._page_request
+        
+        def on_loaded(more):
+            if request != self._page_request:
+                return
+            if more is False:
+                self.refresh_table()
+                return
+            for row in more:
+                if len(self.table.rows) < self.rows_per_page and self.table.index_of(row.student_id) is None:
+                    self.table.insert_row(len(self.table.rows), row)
+        
+        self.executor.submit(
+            self.db.get_students_keyset, self.page_filters,
+            after=after, limit=self.rows_per_page - len(rows), row_factory=Student,
+            callback=on_loaded,
+            errback=lambda e: self.refresh_table(),
+            key="students_backfill"
+        )
+    
+    def place_student(self, student):
+        """Insert where the page's sort order puts it, unless that is on a later page.
+
+        Returns False if the page was reloaded instead.
+        """
+        key, reverse = student_row_sort(self.page_filters)
+        student_key = key(student)
+        rows = self.table.rows
+        position = sum(1 for row in rows if (key(row) > student_key if reverse else key(row) < student_key))
+        if position == 0 and self.current_page > 1:
+            # It lands on an earlier page, whose last row now moves down onto this one
+            self.refresh_table()
+            return False
+        if position == len(rows) == self.rows_per_page:
+            return True
+        self.table.insert_row(position, student)
+        self.table.select(position)
+        if len(rows) > self.rows_per_page:
+            self.table.remove_row(len(rows) - 1)
+        return True
     
     def update_pagination_info(self, total_students):
-        self.page_info.config(text=f"Page {self.current_page} of {self.total_pages} | Total: {total_students} students")
+        approximate = "" if self.count_exact else "~"
+        self.page_info.config(
+            text=f"Page {self.current_page} of {approximate}{self.total_pages} | "
+                 f"Total: {approximate}{total_students} students"
+        )
         
         self.btn_first.config(state="normal" if self.current_page > 1 else "disabled")
         self.btn_prev.config(state="normal" if self.current_page > 1 else "disabled")
@@ -335,6 +621,10 @@ class MainWindow:
         if selected_gender and selected_gender != "All Genders":
             filters['gender'] = selected_gender
         
+        selected_batch = self.enrollment_var.get()
+        if selected_batch and selected_batch != "All Batches":
+            filters['enrollment_year'] = int(selected_batch)
+        
         search_text = self.entry_search.get().strip()
         if search_text:
             search_by = self.search_var.get()
@@ -344,6 +634,7 @@ class MainWindow:
                 filters['search_first_name'] = search_text
             elif search_by == "Last Name":
                 filters['search_last_name'] = search_text
+            filters['search_mode'] = SEARCH_MODES.get(self.search_mode_var.get(), "prefix")
         
         sort_by = self.primary_sort.get()
         if sort_by and sort_by != "Original Order":
@@ -370,6 +661,7 @@ class MainWindow:
         self.college_var.set("")
         self.year_var.set("All Years")
         self.gender_var.set("All Genders")
+        self.enrollment_var.set("All Batches")
         self.entry_search.delete(0, tk.END)
         self.primary_sort.set("Original Order")
         self.sort_order.set("Ascending")
@@ -379,7 +671,13 @@ class MainWindow:
     def apply_sort(self):
         self.refresh_table()
     
+    def on_search_change(self, *args):
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.search_student)
+    
     def search_student(self, event=None):
+        self._search_after_id = None
         self.current_page = 1
         self.refresh_table()
 
@@ -391,15 +689,65 @@ class MainWindow:
         )
         
         if confirm:
-            try:
-                query = "DELETE FROM students"
-                if self.db.execute_query(query):
+            def on_done(success):
+                if success:
                     messagebox.showinfo("Success", "All student records have been deleted")
                     self.refresh_table()
                 else:
                     messagebox.showerror("Error", "Failed to delete student records")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete student records: {str(e)}")
+            
+            self.executor.submit(
+                self.db.clear_all_students,
+                callback=on_done,
+                errback=lambda e: messagebox.showerror("Error", f"Failed to delete student records: {str(e)}")
+            )
+    
+    def import_students(self):
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Import Students",
+            filetypes=[("CSV/TSV files", "*.csv *.tsv *.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        def on_progress(inserted, rejected):
+            self.executor.post(
+                self.busy_label.config, text=f"Importing... {inserted} added, {rejected} rejected"
+            )
+        
+        def on_done(result):
+            message = f"Imported {result['inserted']} students."
+            if result['rejected']:
+                message += f"\n{result['rejected']} rows were rejected, see:\n{result['reject_path']}"
+            messagebox.showinfo("Import Complete", message)
+            self.refresh_table()
+            self.refresh_enrollment_years()
+        
+        self.executor.submit(
+            self.db.import_students, path, progress=on_progress,
+            callback=on_done,
+            errback=lambda e: messagebox.showerror("Import Failed", f"Failed to import students: {str(e)}")
+        )
+    
+    def export_students(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Students",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")]
+        )
+        if not path:
+            return
+        
+        def on_progress(rows_written):
+            self.executor.post(self.busy_label.config, text=f"Exporting... {rows_written} students written")
+        
+        self.executor.submit(
+            self.db.export_students, path, self.get_current_filters(), progress=on_progress,
+            callback=lambda total: messagebox.showinfo("Export Complete", f"Exported {total} students to:\n{path}"),
+            errback=lambda e: messagebox.showerror("Export Failed", f"Failed to export students: {str(e)}")
+        )
     
     def add_student(self):
         add_dialog = tk.Toplevel(self.root)
@@ -438,27 +786,19 @@ class MainWindow:
 
         tk.Label(add_dialog, text="College:").grid(row=6, column=0, padx=5, pady=5)
         college_var = tk.StringVar()
-        colleges = self.db.get_colleges()
-        college_options = [f"{col['college_code']} - {col['college_name']}" for col in colleges]
-        college_dropdown = ttk.Combobox(add_dialog, textvariable=college_var, 
-                                    values=college_options, state='readonly')
+        college_dropdown = ttk.Combobox(add_dialog, textvariable=college_var, state='readonly')
         college_dropdown.grid(row=6, column=1, padx=5, pady=5)
+        ComboboxOptions(self.reference, college_dropdown, "colleges")
 
         tk.Label(add_dialog, text="Course:").grid(row=7, column=0, padx=5, pady=5)
         course_var = tk.StringVar()
         course_dropdown = ttk.Combobox(add_dialog, textvariable=course_var, state='readonly')
         course_dropdown.grid(row=7, column=1, padx=5, pady=5)
+        course_options = ComboboxOptions(self.reference, course_dropdown, "courses")
 
         def update_courses(*args):
             selected_college = college_var.get()
-            if not selected_college:
-                course_dropdown['values'] = []
-                return
-            
-            college_code = selected_college.split(' - ')[0]
-            courses = self.db.get_courses_by_college(college_code)
-            course_options = [f"{course['course_code']} - {course['course_name']}" for course in courses]
-            course_dropdown['values'] = course_options
+            course_options.set_college(selected_college.split(' - ')[0] if selected_college else None)
 
         college_var.trace('w', update_courses)
 
@@ -488,15 +828,6 @@ class MainWindow:
                 messagebox.showerror("Error", "Age must be a number", parent=add_dialog)
                 return
 
-            existing = self.db.execute_query(
-                "SELECT student_id FROM students WHERE student_id = %s",
-                (student_id,),
-                fetch=True
-            )
-            if existing:
-                messagebox.showerror("Error", "Student ID already exists", parent=add_dialog)
-                return
-
             college_code = college.split(' - ')[0]
             course_code = course.split(' - ')[0]
 
@@ -511,35 +842,41 @@ class MainWindow:
                 course_code
             )
 
-            if self.db.add_student(student_data):
-                messagebox.showinfo("Success", "Student added successfully", parent=add_dialog)
-                self.refresh_table()
-                add_dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to add student", parent=add_dialog)
+            def insert():
+                existing = self.db.execute_query(
+                    "SELECT student_id FROM students WHERE student_id = %s",
+                    (student_id,),
+                    fetch=True
+                )
+                if existing:
+                    return None
+                return self.db.add_student(student_data)
+
+            def on_saved(result):
+                if result is None:
+                    messagebox.showerror("Error", "Student ID already exists", parent=add_dialog)
+                elif result:
+                    messagebox.showinfo("Success", "Student added successfully", parent=add_dialog)
+                    self.patch_student(None, self.student_from_data(student_data))
+                    self.refresh_enrollment_years()
+                    add_dialog.destroy()
+                else:
+                    messagebox.showerror("Error", "Failed to add student", parent=add_dialog)
+
+            self.executor.submit(insert, callback=on_saved, owner=add_dialog)
 
         tk.Button(add_dialog, text="Save", command=save_student).grid(row=8, column=0, columnspan=2, pady=10)
 
     
     def update_student(self):
-        selected_item = self.table.selection()
-        if not selected_item:
+        student = self.table.selected_row()
+        if student is None:
             messagebox.showwarning("No Selection", "Please select a student to update.")
             return
-
-        student_id = self.table.item(selected_item)['values'][0]
-        student_data = self.db.execute_query(
-            "SELECT * FROM students WHERE student_id = %s",
-            (student_id,),
-            fetch=True
-        )
-        
-        if not student_data:
-            messagebox.showerror("Error", "Student not found")
-            return
         
-        student_data = student_data[0]
-
+        self.open_update_dialog(student)
+    
+    def open_update_dialog(self, student_data):
         edit_dialog = tk.Toplevel(self.root)
         edit_dialog.title("Update Student")
         edit_dialog.geometry("450x300")
@@ -548,82 +885,61 @@ class MainWindow:
 
         tk.Label(edit_dialog, text="ID# (YYYY-NNNN):").grid(row=0, column=0, padx=5, pady=5)
         id_entry = ValidatedEntry(edit_dialog, validate_type="id")
-        id_entry.insert(0, student_data['student_id'])
+        id_entry.insert(0, student_data.student_id)
         id_entry.grid(row=0, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="First Name:").grid(row=1, column=0, padx=5, pady=5)
         first_name_entry = ValidatedEntry(edit_dialog, validate_type="text")
-        first_name_entry.insert(0, student_data['first_name'])
+        first_name_entry.insert(0, student_data.first_name)
         first_name_entry.grid(row=1, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="Last Name:").grid(row=2, column=0, padx=5, pady=5)
         last_name_entry = ValidatedEntry(edit_dialog, validate_type="text")
-        last_name_entry.insert(0, student_data['last_name'])
+        last_name_entry.insert(0, student_data.last_name)
         last_name_entry.grid(row=2, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="Age:").grid(row=3, column=0, padx=5, pady=5)
         age_entry = tk.Entry(edit_dialog)
-        age_entry.insert(0, student_data['age'])
+        age_entry.insert(0, student_data.age)
         age_entry.grid(row=3, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="Gender:").grid(row=4, column=0, padx=5, pady=5)
-        gender_var = tk.StringVar(value=student_data['gender'])
+        gender_var = tk.StringVar(value=student_data.gender)
         gender_dropdown = ttk.Combobox(edit_dialog, textvariable=gender_var, 
                                     values=["Male", "Female", "Others"], state='readonly')
         gender_dropdown.grid(row=4, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="Year Level:").grid(row=5, column=0, padx=5, pady=5)
-        year_var = tk.StringVar(value=student_data['year_level'])
+        year_var = tk.StringVar(value=student_data.year_level)
         year_dropdown = ttk.Combobox(edit_dialog, textvariable=year_var, 
                                     values=["1st", "2nd", "3rd", "4th", "5+"], state='readonly')
         year_dropdown.grid(row=5, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="College:").grid(row=6, column=0, padx=5, pady=5)
         college_var = tk.StringVar()
-        colleges = self.db.get_colleges()
-        college_options = [f"{col['college_code']} - {col['college_name']}" for col in colleges]
-        college_dropdown = ttk.Combobox(edit_dialog, textvariable=college_var, 
-                                    values=college_options, state='readonly')
-        
-        if student_data['college_code']:
-            current_college = next(
-                (f"{col['college_code']} - {col['college_name']}" 
-                for col in colleges 
-                if col['college_code'] == student_data['college_code']),
-                None
-            )
-            if current_college:
-                college_var.set(current_college)
+        college_dropdown = ttk.Combobox(edit_dialog, textvariable=college_var, state='readonly')
+        ComboboxOptions(self.reference, college_dropdown, "colleges")
+        
+        if student_data.college_code:
+            college_var.set(self.reference.college_label(student_data.college_code))
         
         college_dropdown.grid(row=6, column=1, padx=5, pady=5)
 
         tk.Label(edit_dialog, text="Course:").grid(row=7, column=0, padx=5, pady=5)
         course_var = tk.StringVar()
         course_dropdown = ttk.Combobox(edit_dialog, textvariable=course_var, state='readonly')
+        course_options = ComboboxOptions(
+            self.reference, course_dropdown, "courses", college_code=student_data.college_code
+        )
         
-        if student_data['course_code'] and student_data['college_code']:
-            courses = self.db.get_courses_by_college(student_data['college_code'])
-            current_course = next(
-                (f"{course['course_code']} - {course['course_name']}" 
-                for course in courses 
-                if course['course_code'] == student_data['course_code']),
-                None
-            )
-            if current_course:
-                course_var.set(current_course)
+        if student_data.course_code and student_data.college_code:
+            course_var.set(self.reference.course_label(student_data.course_code))
         
         course_dropdown.grid(row=7, column=1, padx=5, pady=5)
 
         def update_courses(*args):
             selected_college = college_var.get()
-            if not selected_college:
-                course_dropdown['values'] = []
-                return
-            
-            college_code = selected_college.split(' - ')[0]
-            courses = self.db.get_courses_by_college(college_code)
-            course_options = [f"{course['course_code']} - {course['course_name']}" for course in courses]
-            course_dropdown['values'] = course_options
+            course_options.set_college(selected_college.split(' - ')[0] if selected_college else None)
 
         college_var.trace('w', update_courses)
 
@@ -653,16 +969,6 @@ class MainWindow:
                 messagebox.showerror("Error", "Age must be a number", parent=edit_dialog)
                 return
 
-            if new_student_id != student_data['student_id']:
-                existing = self.db.execute_query(
-                    "SELECT student_id FROM students WHERE student_id = %s",
-                    (new_student_id,),
-                    fetch=True
-                )
-                if existing:
-                    messagebox.showerror("Error", "Student ID already exists", parent=edit_dialog)
-                    return
-
             college_code = college.split(' - ')[0]
             course_code = course.split(' - ')[0]
 
@@ -677,42 +983,60 @@ class MainWindow:
                 course_code
             )
 
-            try:
-                if self.db.update_student(student_data['student_id'], updated_data):
+            def save():
+                if new_student_id != student_data.student_id:
+                    existing = self.db.execute_query(
+                        "SELECT student_id FROM students WHERE student_id = %s",
+                        (new_student_id,),
+                        fetch=True
+                    )
+                    if existing:
+                        return None
+                return self.db.update_student(student_data.student_id, updated_data)
+
+            def on_saved(result):
+                if result is None:
+                    messagebox.showerror("Error", "Student ID already exists", parent=edit_dialog)
+                elif result:
                     messagebox.showinfo("Success", "Student updated successfully", parent=edit_dialog)
-                    self.refresh_table()
+                    self.patch_student(student_data.student_id, self.student_from_data(updated_data))
+                    self.refresh_enrollment_years()
                     edit_dialog.destroy()
                 else:
                     messagebox.showerror("Error", "Failed to update student", parent=edit_dialog)
-            except Exception as e:
-                messagebox.showerror("Database Error", f"Error updating student: {str(e)}", parent=edit_dialog)
+
+            self.executor.submit(
+                save,
+                callback=on_saved,
+                errback=lambda e: messagebox.showerror(
+                    "Database Error", f"Error updating student: {str(e)}", parent=edit_dialog
+                ),
+                owner=edit_dialog
+            )
 
         tk.Button(edit_dialog, text="Save Changes", command=save_changes).grid(row=8, column=0, columnspan=2, pady=10)
     
     def delete_student(self):
-        selected_item = self.table.selection()
-        if not selected_item:
+        student = self.table.selected_row()
+        if student is None:
             messagebox.showwarning("No Selection", "Please select a student to delete.")
             return
         
-        student_id = self.table.item(selected_item)['values'][0]
+        student_id = student.student_id
         
         confirm = messagebox.askyesno("Delete Confirmation", "Are you sure you want to delete this student?")
         if confirm:
-            if self.db.delete_student(student_id):
-                self.refresh_table()
-                messagebox.showinfo("Success", "Student deleted successfully")
-            else:
-                messagebox.showerror("Error", "Failed to delete student")
+            def on_deleted(success):
+                if success:
+                    self.patch_student(student_id, None)
+                    messagebox.showinfo("Success", "Student deleted successfully")
+                else:
+                    messagebox.showerror("Error", "Failed to delete student")
+            
+            self.executor.submit(self.db.delete_student, student_id, callback=on_deleted)
     
     def open_college_manager(self):
         CollegeManager(self.root, self.db, self)
     
     def open_course_manager(self):
         CourseManager(self.root, self.db, self)
-    
-    def refresh_filter_values(self):
-        colleges = self.db.get_colleges()
-        college_values = ["All Colleges"] + [f"{col['college_code']} - {col['college_name']}" for col in colleges]
-        self.college_filter['values'] = college_values
-        self.college_filter.set("All Colleges")
\ No newline at end of file
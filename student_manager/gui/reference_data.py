@@ -0,0 +1,207 @@
+import bisect
+
+
+def option_label(code, name):
+    return f"{code} - {name}"
+
+
+class ReferenceStore:
+    """Colleges and courses held in memory and shared by every window.
+
+    Loaded once in the background; after a successful write the managers
+    report the change here and subscribers are told which code changed,
+    so they can patch their option lists instead of re-querying.
+    Listeners are called on the Tk thread as listener(kind, old_code, new_code)
+    with kind "college", "course" or "reload"; old_code is None for an
+    insert and new_code is None for a delete.
+    """
+
+    def __init__(self, db, executor):
+        self.db = db
+        self.executor = executor
+        self.colleges = {}
+        self.courses = {}
+        self.courses_by_college = {}
+        self.loaded = False
+        self._listeners = []
+
+    def load(self):
+        def fetch():
+            colleges = self.db.get_colleges()
+            courses = self.db.get_courses()
+            if colleges is False or courses is False:
+                raise RuntimeError("Could not load colleges and courses")
+            return colleges, courses
+
+        self.executor.submit(
+            fetch,
+            callback=self._on_loaded,
+            errback=lambda e: print(f"Error loading colleges and courses: {e}"),
+            key="reference_data"
+        )
+
+    def _on_loaded(self, result):
+        colleges, courses = result
+        self.colleges = {c['college_code']: c['college_name'] for c in colleges}
+        self.courses = {}
+        self.courses_by_college = {}
+        for course in courses:
+            self._index_course(course['course_code'], course['course_name'], course['college_code'])
+        self.loaded = True
+        self._notify("reload", None, None)
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, kind, old_code, new_code):
+        for listener in list(self._listeners):
+            listener(kind, old_code, new_code)
+
+    def _index_course(self, code, name, college_code):
+        self.courses[code] = (name, college_code)
+        self.courses_by_college.setdefault(college_code, set()).add(code)
+
+    def _unindex_course(self, code):
+        name, college_code = self.courses.pop(code)
+        codes = self.courses_by_college.get(college_code)
+        if codes is not None:
+            codes.discard(code)
+            if not codes:
+                del self.courses_by_college[college_code]
+        return name, college_code
+
+    def college_label(self, code):
+        name = self.colleges.get(code)
+        return option_label(code, name) if name is not None else ""
+
+    def course_label(self, code):
+        course = self.courses.get(code)
+        return option_label(code, course[0]) if course is not None else ""
+
+    def put_college(self, code, name, old_code=None):
+        """Record an added (old_code None) or edited college"""
+        if old_code is not None and old_code != code:
+            self.colleges.pop(old_code, None)
+            # update_college moves the college's courses along with it
+            for course_code in list(self.courses_by_college.get(old_code, ())):
+                course_name, _ = self._unindex_course(course_code)
+                self._index_course(course_code, course_name, code)
+        elif old_code is not None:
+            self.colleges.pop(old_code, None)
+        self.colleges[code] = name
+        self._notify("college", old_code, code)
+
+    def remove_college(self, code):
+        if self.colleges.pop(code, None) is None:
+            return
+        # delete_college leaves its courses without a college
+        for course_code in list(self.courses_by_college.get(code, ())):
+            course_name, _ = self._unindex_course(course_code)
+            self._index_course(course_code, course_name, None)
+        self._notify("college", code, None)
+
+    def put_course(self, code, name, college_code, old_code=None):
+        """Record an added (old_code None) or edited course"""
+        if old_code is not None and old_code in self.courses:
+            self._unindex_course(old_code)
+        self._index_course(code, name, college_code)
+        self._notify("course", old_code, code)
+
+    def remove_course(self, code):
+        if code not in self.courses:
+            return
+        self._unindex_course(code)
+        self._notify("course", code, None)
+
+
+class ComboboxOptions:
+    """Keeps a combobox's "CODE - Name" values in step with a ReferenceStore.
+
+    kind is "colleges" or "courses"; course lists are limited to college_code.
+    Changes are applied to the sorted option list one entry at a time, and a
+    selection that is renamed or removed follows along.
+    """
+
+    def __init__(self, store, combobox, kind, leading=(), college_code=None):
+        self.store = store
+        self.combobox = combobox
+        self.kind = kind
+        self.leading = list(leading)
+        self.college_code = college_code
+        self._entries = []
+        self._names = {}
+        self.rebuild()
+        store.subscribe(self.on_change)
+        combobox.bind("<Destroy>", self.on_destroy, add="+")
+
+    def on_destroy(self, event):
+        if event.widget is self.combobox:
+            self.store.unsubscribe(self.on_change)
+
+    def set_college(self, college_code):
+        if college_code != self.college_code:
+            self.college_code = college_code
+            self.rebuild()
+
+    def rebuild(self):
+        if self.kind == "colleges":
+            items = self.store.colleges.items()
+        elif self.college_code is None:
+            items = ()
+        else:
+            items = (
+                (code, self.store.courses[code][0])
+                for code in self.store.courses_by_college.get(self.college_code, ())
+            )
+        self._names = dict(items)
+        self._entries = sorted((name, code) for code, name in self._names.items())
+        self._apply()
+
+    def _apply(self):
+        self.combobox['values'] = self.leading + [option_label(code, name) for name, code in self._entries]
+
+    def _remove(self, code):
+        name = self._names.pop(code, None)
+        if name is None:
+            return None
+        del self._entries[bisect.bisect_left(self._entries, (name, code))]
+        return option_label(code, name)
+
+    def _insert(self, code, name):
+        self._names[code] = name
+        bisect.insort(self._entries, (name, code))
+        return option_label(code, name)
+
+    def on_change(self, kind, old_code, new_code):
+        if kind == "reload":
+            self.rebuild()
+            return
+
+        if self.kind == "courses" and kind == "college":
+            # A renamed college keeps its courses; a deleted one takes them away
+            if old_code is not None and old_code == self.college_code:
+                self.set_college(new_code)
+                if new_code is None:
+                    self.combobox.set("")
+            return
+
+        if kind != self.kind[:-1]:
+            return
+
+        old_label = self._remove(old_code) if old_code is not None else None
+        new_label = None
+        if new_code is not None:
+            if self.kind == "colleges":
+                new_label = self._insert(new_code, self.store.colleges[new_code])
+            else:
+                name, college_code = self.store.courses[new_code]
+                if college_code is not None and college_code == self.college_code:
+                    new_label = self._insert(new_code, name)
+        self._apply()
+
+        if old_label is not None and self.combobox.get() == old_label:
+            self.combobox.set(new_label or (self.leading[0] if self.leading else ""))
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 import re
+from collections import OrderedDict
 from utils.validation import validate_id_format, validate_text_only
 
 class ValidatedEntry(tk.Entry):
@@ -43,4 +44,280 @@ class LabelInput(tk.Frame):
         self.input.insert(index, text)
     
     def delete(self, first, last=None):
-        self.input.delete(first, last)
\ No newline at end of file
+        self.input.delete(first, last)
+
+class VirtualTreeview(tk.Frame):
+    """Treeview showing a scrolling window onto any number of rows.
+
+    Only one item exists per visible line; scrolling rewrites those items'
+    values in place, so redraw cost follows the window height rather than
+    the row count. Rows come either from set_rows(list) or lazily from
+    set_source(total, fetch): fetch(start, count, done) loads rows
+    [start, start + count) however it likes and calls done(rows) on the
+    Tk thread, or done(None) if the fetch failed: the block then keeps its
+    placeholders and is fetched again the next time it is drawn. Lazily
+    fetched blocks are kept in a small LRU cache.
+
+    Rows may be any objects: display(row) gives the column values (the row
+    itself by default) and key(row) its identity (row[0] by default), which
+    index_of() looks up so a single row can be patched after a write.
+    Selection is tracked by row index, not by item, and survives scrolling.
+    """
+
+    def __init__(self, parent, columns, height=15, block_size=200, cached_blocks=32,
+                 placeholder="...", display=None, key=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columns = columns
+        self.display = display or (lambda row: row)
+        self.key = key or (lambda row: row[0])
+        self.block_size = block_size
+        self.cached_blocks = cached_blocks
+        self.placeholder = (placeholder,) + ("",) * (len(columns) - 1)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.total = 0
+        self.offset = 0
+        self.rows = None
+        self._index = None
+        self._fetch = None
+        self._blocks = OrderedDict()
+        self._requested = set()
+        self._generation = 0
+        self._selected = None
+        self._slots = []
+        self._shown = 0
+        self._visible = height
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-"), ("<Next>", "page+"),
+                          ("<Home>", "home"), ("<End>", "end")):
+            self.tree.bind(key, lambda e, step=step: self._on_key(step))
+
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    # Data
+
+    def set_rows(self, rows, keep_position=False):
+        """Show an in-memory list of rows"""
+        self._reset(len(rows), keep_position)
+        self.rows = list(rows)
+        self._render()
+
+    def set_source(self, total, fetch, keep_position=False):
+        """Show total rows loaded on demand through fetch(start, count, done)"""
+        self._reset(total, keep_position)
+        self._fetch = fetch
+        self._render()
+
+    def _reset(self, total, keep_position):
+        self._generation += 1
+        self.rows = None
+        self._index = None
+        self._fetch = None
+        self._blocks.clear()
+        self._requested.clear()
+        self._selected = None
+        self.total = total
+        self.offset = self._clamp(self.offset if keep_position else 0)
+
+    def row(self, index):
+        """Values of row index, or None when it has not been fetched yet"""
+        if not 0 <= index < self.total:
+            return None
+        if self.rows is not None:
+            return self.rows[index]
+        block_number, position = divmod(index, self.block_size)
+        block = self._blocks.get(block_number)
+        if block is None:
+            self._request(block_number)
+            return None
+        self._blocks.move_to_end(block_number)
+        return block[position] if position < len(block) else None
+
+    # Single-row patches; these need rows from set_rows
+
+    def index_of(self, key):
+        """Index of the row with this key, or None"""
+        if self._index is None:
+            self._index = {self.key(row): index for index, row in enumerate(self.rows or ())}
+        return self._index.get(key)
+
+    def update_row(self, index, row):
+        self.rows[index] = row
+        self._index = None
+        slot = index - self.offset
+        if 0 <= slot < self._shown:
+            self.tree.item(self._slots[slot], values=self.display(row))
+
+    def insert_row(self, index, row):
+        self.rows.insert(index, row)
+        self._index = None
+        self.total += 1
+        if self._selected is not None and self._selected >= index:
+            self._selected += 1
+        self._render()
+
+    def remove_row(self, index):
+        del self.rows[index]
+        self._index = None
+        self.total -= 1
+        if self._selected == index:
+            self._selected = None
+        elif self._selected is not None and self._selected > index:
+            self._selected -= 1
+        self.offset = self._clamp(self.offset)
+        self._render()
+
+    def _request(self, block_number):
+        if block_number in self._requested or self._fetch is None:
+            return
+        self._requested.add(block_number)
+        generation = self._generation
+        start = block_number * self.block_size
+
+        def done(rows):
+            if generation != self._generation:
+                return
+            self._requested.discard(block_number)
+            # Database methods return False on error
+            if rows is None or rows is False:
+                return
+            self._blocks[block_number] = rows
+            while len(self._blocks) > self.cached_blocks:
+                self._blocks.popitem(last=False)
+            first, last = self.offset, self.offset + self._visible
+            if start < last and start + self.block_size > first:
+                self._render()
+
+        self._fetch(start, min(self.block_size, self.total - start), done)
+
+    # Selection
+
+    def selected_index(self):
+        return self._selected
+
+    def selected_row(self):
+        return None if self._selected is None else self.row(self._selected)
+
+    def select(self, index):
+        self._selected = index if 0 <= index < self.total else None
+        self._render()
+
+    def clear_selection(self):
+        self._selected = None
+        self.tree.selection_set(())
+
+    def index_at(self, y):
+        """Row index under a y coordinate, or None"""
+        item = self.tree.identify_row(y)
+        if not item:
+            return None
+        return self.offset + self._slots.index(item)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self._selected = self.offset + self._slots.index(selection[0])
+        elif self._selected is not None and self.offset <= self._selected < self.offset + self._shown:
+            # Deselected by the user; selection cleared by scrolling keeps its row
+            self._selected = None
+
+    # Scrolling
+
+    def _clamp(self, offset):
+        return max(0, min(offset, self.total - self._visible))
+
+    def scroll_to(self, offset):
+        offset = self._clamp(int(offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def see(self, index):
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self._visible:
+            self.scroll_to(index - self._visible + 1)
+
+    def _scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command: moveto fraction, or scroll n units/pages"""
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_key(self, step):
+        current = self.offset if self._selected is None else self._selected
+        if step == "page-":
+            target = current - self._visible
+        elif step == "page+":
+            target = current + self._visible
+        elif step == "home":
+            target = 0
+        elif step == "end":
+            target = self.total - 1
+        else:
+            target = current + step
+        if self.total:
+            target = max(0, min(target, self.total - 1))
+            self.see(target)
+            self.select(target)
+        return "break"
+
+    def _on_configure(self, event):
+        # One item per line that fits: measure a drawn row if there is one
+        box = self.tree.bbox(self._slots[0]) if self._shown else ""
+        if box:
+            visible = max(1, (self.tree.winfo_height() - box[1]) // box[3])
+            if visible != self._visible:
+                self._visible = visible
+                self.offset = self._clamp(self.offset)
+                self._render()
+
+    # Drawing
+
+    def _render(self):
+        shown = max(0, min(self._visible, self.total - self.offset))
+        while len(self._slots) < shown:
+            self._slots.append(self.tree.insert("", "end", values=self.placeholder))
+        for slot in range(shown):
+            row = self.row(self.offset + slot)
+            self.tree.item(self._slots[slot], values=self.placeholder if row is None else self.display(row))
+        if shown != self._shown:
+            # Spare items are detached rather than deleted, ready for the next longer list
+            for slot in range(shown, self._shown):
+                self.tree.detach(self._slots[slot])
+            for slot in range(self._shown, shown):
+                self.tree.move(self._slots[slot], "", slot)
+            self._shown = shown
+
+        selected = self._selected
+        if selected is not None and self.offset <= selected < self.offset + shown:
+            self.tree.selection_set(self._slots[selected - self.offset])
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + shown) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
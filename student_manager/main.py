@@ -12,12 +12,10 @@ except ImportError:
     print("GUI module not found. Creating a simple test interface...")
     MainWindow = None
 
-from database.mysql_db import MySQLDatabase
+from database.base import create_database
 from config import DB_CONFIG
 
-def initialize_database():
-    db = MySQLDatabase()
-    
+def initialize_database(db):
     try:
         result = db.execute_query("SELECT 1 FROM colleges LIMIT 1", fetch=True)
         if result is False:  
@@ -39,15 +37,16 @@ def initialize_database():
             "Database Error",
             "Required tables not found. Create new database structure?"
         ):
-            from database.setup import setup_database
-            if setup_database():
+            if db.setup():
                 print("Database setup completed")
             else:
                 raise Exception("Database setup failed")
         else:
             raise Exception("Database validation failed and user declined setup")
-    finally:
-        db.close()
+
+    # Outside the try: a failed migration on existing tables must not offer setup over them
+    if not db.migrate():
+        raise Exception("Database migration failed; see the console for details")
 
 def create_simple_test_window(db):
     """Create a simple test window if the main GUI is not available"""
@@ -101,7 +100,8 @@ def create_simple_test_window(db):
 
 def main():
     try:
-        initialize_database()
+        db = create_database()
+        initialize_database(db)
         
         root = tk.Tk()
         root.title(DB_CONFIG.get('app_name', 'Student Management System'))
@@ -113,9 +113,6 @@ def main():
             pass  
 
         
-        db = MySQLDatabase()
-        
-        
         if MainWindow:
             app = MainWindow(root, db)
         else:
@@ -124,6 +121,8 @@ def main():
         
         def on_closing():
             if messagebox.askokcancel("Quit", "Do you want to exit the application?"):
+                if MainWindow:
+                    app.executor.shutdown()
                 if 'db' in locals():
                     db.close()
                 root.destroy()
@@ -0,0 +1,312 @@
+"""Generate realistic synthetic colleges, courses and students.
+
+Run from the student_manager directory:
+
+    python -m utils.datagen --students 100000 --seed 42 --db --truncate
+    python -m utils.datagen --students 1000000 --max-years 150 --seed 42 --out data/generated
+
+--db streams batched multi-row INSERTs through the configured backend's add_students;
+--out writes tab-separated files plus a load.sql for LOAD DATA LOCAL INFILE.
+The same seed always produces the same rows. enrollment_year is the ID's YYYY
+prefix, so each year holds at most 9999 students: by default the rows span at
+most 12 years (119,988 students); --max-years trades realism for volume.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import date
+from itertools import accumulate
+
+from utils.formats import GENDERS, YEAR_LEVELS
+
+GENDER_WEIGHTS = (48, 48, 4)
+YEAR_LEVEL_WEIGHTS = (30, 25, 20, 18, 7)
+IDS_PER_YEAR = 9999
+MAX_ENROLLMENT_YEARS = 12
+
+CATALOG = (
+    ("CCS", "College Of Computer Studies", (
+        ("BSCS", "Bachelor Of Science In Computer Science"),
+        ("BSIT", "Bachelor Of Science In Information Technology"),
+        ("BSIS", "Bachelor Of Science In Information Systems"),
+        ("BSCA", "Bachelor Of Science In Computer Applications"))),
+    ("COE", "College Of Engineering", (
+        ("BSCE", "Bachelor Of Science In Civil Engineering"),
+        ("BSEE", "Bachelor Of Science In Electrical Engineering"),
+        ("BSME", "Bachelor Of Science In Mechanical Engineering"),
+        ("BSCHE", "Bachelor Of Science In Chemical Engineering"),
+        ("BSCPE", "Bachelor Of Science In Computer Engineering"))),
+    ("CSM", "College Of Science And Mathematics", (
+        ("BSBIO", "Bachelor Of Science In Biology"),
+        ("BSCHEM", "Bachelor Of Science In Chemistry"),
+        ("BSMATH", "Bachelor Of Science In Mathematics"),
+        ("BSPHYS", "Bachelor Of Science In Physics"))),
+    ("CBAA", "College Of Business Administration And Accountancy", (
+        ("BSA", "Bachelor Of Science In Accountancy"),
+        ("BSBA-FM", "Bachelor Of Science In Business Administration Major In Financial Management"),
+        ("BSBA-MM", "Bachelor Of Science In Business Administration Major In Marketing Management"))),
+    ("CED", "College Of Education", (
+        ("BEED", "Bachelor Of Elementary Education"),
+        ("BSED-MATH", "Bachelor Of Secondary Education Major In Mathematics"),
+        ("BSED-ENG", "Bachelor Of Secondary Education Major In English"))),
+    ("CASS", "College Of Arts And Social Sciences", (
+        ("ABENG", "Bachelor Of Arts In English"),
+        ("ABPSY", "Bachelor Of Arts In Psychology"),
+        ("ABHIST", "Bachelor Of Arts In History"),
+        ("ABPOLSCI", "Bachelor Of Arts In Political Science"))),
+    ("CON", "College Of Nursing", (
+        ("BSN", "Bachelor Of Science In Nursing"),)),
+    ("CHS", "College Of Health Sciences", (
+        ("BSMT", "Bachelor Of Science In Medical Technology"),
+        ("BSPT", "Bachelor Of Science In Physical Therapy"))),
+)
+
+FIRST_NAMES = (
+    "JUAN", "MARIA", "JOSE", "ANA", "JOHN", "MARK", "ANGEL", "JOSHUA", "PRINCESS", "MICHAEL",
+    "KRISTINE", "CHRISTIAN", "JASMINE", "PAUL", "NICOLE", "JAMES", "JOY", "RAFAEL", "GRACE", "CARLO",
+    "ANDREA", "MIGUEL", "CAMILLE", "GABRIEL", "ISABEL", "DANIEL", "PATRICIA", "KEVIN", "ERICA", "JOMAR",
+    "RICA", "ARVIN", "LEA", "RENZ", "SHEENA", "VINCE", "MAE", "JERICHO", "ABIGAIL", "RONALD",
+    "MARIA CLARA", "JOHN PAUL", "MARK ANTHONY", "ANNE MARIE", "JAN MICHAEL", "KIM", "ALDRIN", "DIANA", "EDGAR", "FAITH"
+)
+LAST_NAMES = (
+    "SANTOS", "REYES", "CRUZ", "BAUTISTA", "OCAMPO", "GARCIA", "MENDOZA", "TORRES", "TOMAS", "ANDRADA",
+    "CASTILLO", "FLORES", "VILLANUEVA", "RAMOS", "CASTRO", "RIVERA", "AQUINO", "NAVARRO", "SALAZAR", "MERCADO",
+    "DELA CRUZ", "DEL ROSARIO", "GONZALES", "LOPEZ", "HERNANDEZ", "PEREZ", "DIAZ", "SORIANO", "MORALES", "VALDEZ",
+    "DUMAGUETE", "MACARAEG", "PANGILINAN", "LIM", "TAN", "GO", "SY", "CHUA", "ABELLA", "BACALSO",
+    "CABAHUG", "DAGOHOY", "ESPINA", "FERNANDEZ", "GALLARDO", "IBARRA", "JIMENEZ", "LAGUNDI", "MAGSAYSAY", "QUIMPO"
+)
+
+
+def _zipf_weights(count, exponent=1.0):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _cumulative(weights):
+    return list(accumulate(weights))
+
+
+class StudentGenerator:
+    """Deterministic source of catalog and student rows.
+
+    Colleges, courses and names are drawn with Zipf-like skew, recent
+    enrollment years hold more students than older ones, and ages follow
+    the year level. Student IDs come out in ascending order, which keeps
+    InnoDB primary-key inserts sequential.
+    """
+
+    def __init__(self, seed=0, end_year=None, max_years=MAX_ENROLLMENT_YEARS):
+        self.seed = seed
+        self.end_year = end_year or date.today().year
+        self.max_years = max_years
+        self.colleges = [(code, name) for code, name, _ in CATALOG]
+        self.courses = [
+            (course_code, course_name, college_code)
+            for college_code, _, courses in CATALOG
+            for course_code, course_name in courses
+        ]
+
+        college_weights = dict(zip((code for code, _ in self.colleges), _zipf_weights(len(self.colleges), 0.7)))
+        course_weights = []
+        for college_code, _, courses in CATALOG:
+            for weight in _zipf_weights(len(courses), 0.9):
+                course_weights.append(college_weights[college_code] * weight / len(courses))
+        self._course_cum = _cumulative(course_weights)
+        self._first_cum = _cumulative(_zipf_weights(len(FIRST_NAMES), 0.8))
+        self._last_cum = _cumulative(_zipf_weights(len(LAST_NAMES), 0.8))
+        self._gender_cum = _cumulative(GENDER_WEIGHTS)
+        self._level_cum = _cumulative(YEAR_LEVEL_WEIGHTS)
+
+    def year_counts(self, total, growth=1.06):
+        """Split total students across enrollment years, growing toward end_year"""
+        needed = math.ceil(total / IDS_PER_YEAR)
+        if needed > self.max_years:
+            raise ValueError(
+                f"{total:,} students need {needed} enrollment years of {IDS_PER_YEAR} IDs, "
+                f"more than the {self.max_years} allowed"
+            )
+        years = min(self.max_years, max(min(8, total), math.ceil(total / IDS_PER_YEAR * 1.5)))
+        if years > self.end_year:
+            raise ValueError(f"{total} students do not fit the YYYY-NNNN ID format")
+        weights = [growth ** i for i in range(years)]
+        counts = [0] * years
+        remaining = total
+        open_years = list(range(years))
+        # Hand out students by weight; years that hit the ID limit pass the rest on
+        while remaining:
+            scale = sum(weights[i] for i in open_years)
+            handed = 0
+            for i in list(open_years):
+                share = min(IDS_PER_YEAR - counts[i], max(1, round(remaining * weights[i] / scale)))
+                share = min(share, remaining - handed)
+                counts[i] += share
+                handed += share
+                if counts[i] >= IDS_PER_YEAR:
+                    open_years.remove(i)
+                if handed == remaining:
+                    break
+            remaining -= handed
+        first_year = self.end_year - years + 1
+        return [(first_year + i, count) for i, count in enumerate(counts) if count]
+
+    def students(self, total, batch_size=10000):
+        """Yield lists of student tuples in STUDENT_COLUMNS order"""
+        rng = random.Random(self.seed)
+        batch = []
+        for year, count in self.year_counts(total):
+            serials = sorted(rng.sample(range(1, IDS_PER_YEAR + 1), count))
+            position = 0
+            while position < count:
+                size = min(batch_size - len(batch), count - position)
+                courses = rng.choices(self.courses, cum_weights=self._course_cum, k=size)
+                firsts = rng.choices(FIRST_NAMES, cum_weights=self._first_cum, k=size)
+                lasts = rng.choices(LAST_NAMES, cum_weights=self._last_cum, k=size)
+                genders = rng.choices(GENDERS, cum_weights=self._gender_cum, k=size)
+                levels = rng.choices(range(len(YEAR_LEVELS)), cum_weights=self._level_cum, k=size)
+                for i in range(size):
+                    level = levels[i]
+                    if rng.random() < 0.03:
+                        age = rng.randint(25, 60)
+                    else:
+                        age = 17 + level + rng.randint(0, 2)
+                    course_code, _, college_code = courses[i]
+                    batch.append((
+                        f"{year}-{serials[position + i]:04d}",
+                        firsts[i],
+                        lasts[i],
+                        age,
+                        genders[i],
+                        YEAR_LEVELS[level],
+                        college_code,
+                        course_code
+                    ))
+                position += size
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _write_tsv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for row in rows:
+            f.write("\t".join(_tsv_value(value) for value in row))
+            f.write("\n")
+
+
+def write_files(generator, total, out_dir, batch_size=10000, progress=None):
+    """Write colleges/courses/students TSV files and a load.sql that loads them in FK order"""
+    os.makedirs(out_dir, exist_ok=True)
+    out_dir = os.path.abspath(out_dir)
+    _write_tsv(os.path.join(out_dir, "colleges.tsv"), generator.colleges)
+    _write_tsv(os.path.join(out_dir, "courses.tsv"), generator.courses)
+
+    written = 0
+    with open(os.path.join(out_dir, "students.tsv"), "w", encoding="utf-8", newline="\n") as f:
+        for batch in generator.students(total, batch_size):
+            f.writelines("\t".join(_tsv_value(value) for value in row) + "\n" for row in batch)
+            written += len(batch)
+            if progress:
+                progress(written)
+
+    tables = (
+        ("colleges", "colleges.tsv", "college_code, college_name"),
+        ("courses", "courses.tsv", "course_code, course_name, college_code"),
+        ("students", "students.tsv",
+         "student_id, first_name, last_name, age, gender, year_level, college_code, course_code"),
+    )
+    with open(os.path.join(out_dir, "load.sql"), "w", encoding="utf-8") as f:
+        f.write("-- mysql --local-infile=1 <database> < load.sql\n")
+        for table, filename, columns in tables:
+            path = os.path.join(out_dir, filename).replace("\\", "/")
+            f.write(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table}\n"
+                f"    CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'\n"
+                f"    ({columns});\n"
+            )
+    return written
+
+
+def load_database(db, generator, total, batch_size=5000, truncate=False, progress=None):
+    """Insert the catalog (skipping existing codes) and stream students in batched INSERTs"""
+    if truncate:
+        db.execute_query("DELETE FROM students", tables=('students',))
+
+    existing_colleges = {c['college_code'] for c in db.get_colleges() or []}
+    for code, name in generator.colleges:
+        if code not in existing_colleges:
+            db.add_college(code, name)
+    existing_courses = {c['course_code'] for c in db.get_course_colleges() or []}
+    for code, name, college_code in generator.courses:
+        if code not in existing_courses:
+            db.add_course(code, name, college_code)
+
+    inserted = 0
+    for batch in generator.students(total, batch_size):
+        if not db.add_students(batch):
+            raise RuntimeError(f"Batch starting at {batch[0][0]} was rejected; "
+                               "use --truncate if the IDs already exist")
+        inserted += len(batch)
+        if progress:
+            progress(inserted)
+    return inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic student data")
+    parser.add_argument("--students", type=int, required=True, help="number of students to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("--end-year", type=int, help="latest enrollment year (default: this year)")
+    parser.add_argument("--max-years", type=int, default=MAX_ENROLLMENT_YEARS,
+                        help=f"most enrollment years to spread students over; each holds {IDS_PER_YEAR} "
+                             "(default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT or write (default: %(default)s)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", action="store_true", help="insert into the database selected by config.DB_BACKEND")
+    target.add_argument("--out", help="directory for TSV files and load.sql")
+    parser.add_argument("--truncate", action="store_true", help="with --db, delete existing students first")
+    args = parser.parse_args(argv)
+
+    generator = StudentGenerator(args.seed, args.end_year, args.max_years)
+    try:
+        generator.year_counts(args.students)
+    except ValueError as e:
+        parser.error(f"{e}; pass a larger --max-years")
+    started = time.perf_counter()
+
+    def progress(count):
+        if count % 100000 < args.batch_size or count == args.students:
+            rate = count / max(time.perf_counter() - started, 1e-9)
+            print(f"{count:,} / {args.students:,} students ({rate:,.0f}/s)", file=sys.stderr)
+
+    if args.out:
+        written = write_files(generator, args.students, args.out, args.batch_size, progress)
+        print(f"Wrote {written:,} students to {os.path.abspath(args.out)}")
+        return 0
+
+    from database.base import create_database
+    db = create_database()
+    if db.pool is None:
+        return 1
+    try:
+        inserted = load_database(db, generator, args.students, args.batch_size, args.truncate, progress)
+    except RuntimeError as e:
+        print(f"Error generating students: {e}")
+        return 1
+    finally:
+        db.close()
+    print(f"Inserted {inserted:,} students in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import re
+
+# Pure predicates and schema values shared by the GUI, the importer and the
+# database layer; no tkinter here
+
+# The students.gender and students.year_level ENUMs, in declaration order
+GENDERS = ("Male", "Female", "Others")
+YEAR_LEVELS = ("1st", "2nd", "3rd", "4th", "5+")
+
+ID_PATTERN = re.compile(r'^\d{4}-\d{4}$')
+
+def is_valid_id_format(id_no):
+    return ID_PATTERN.match(id_no) is not None
+
+def is_text_only(text):
+    return not any(char.isdigit() for char in text)
+
+def is_valid_age(age):
+    try:
+        return 0 < int(age) <= 120
+    except (TypeError, ValueError):
+        return False
@@ -1,14 +1,15 @@
 import re
 from tkinter import messagebox
+from utils.formats import is_valid_id_format, is_text_only
 
 def validate_id_format(id_no, field_name="ID#", parent=None):
-    if not re.match(r'^\d{4}-\d{4}$', id_no):
+    if not is_valid_id_format(id_no):
         messagebox.showerror("Invalid Format", f"{field_name} must be in the format YYYY-NNNN", parent=parent)
         return False
     return True
 
 def validate_text_only(text, field_name):
-    if any(char.isdigit() for char in text):
+    if not is_text_only(text):
         messagebox.showerror("Invalid Input", f"{field_name} must not contain numbers")
         return False
     return True